@@ -0,0 +1,119 @@
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # optional: fall back to greedy matching
+    linear_sum_assignment = None
+
+DENSE_LIMIT = 4096  # plate x rider pairs scored as one matrix; above this a grid index is used
+
+
+def rider_zones(riders, side=0.25, below=0.6):
+    """Where a rider's plate can be: the rider box widened by `side` and extended
+    `below` of its height downwards (the plate hangs under the seat)."""
+    riders = riders.astype(np.float32)
+    w = riders[:, 2] - riders[:, 0]
+    h = riders[:, 3] - riders[:, 1]
+    return np.stack([riders[:, 0] - side * w, riders[:, 1],
+                     riders[:, 2] + side * w, riders[:, 3] + below * h], axis=1)
+
+
+def candidate_pairs(plate_centers, zones):
+    """(plate index, rider index) arrays of plates whose centre falls in a rider zone.
+
+    Small scenes test every pair at once. Large ones bucket the zones into a
+    uniform grid (cell size ~ the median zone) so each plate is only tested
+    against the zones covering its cell.
+    """
+    n, m = len(plate_centers), len(zones)
+    if n == 0 or m == 0:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    if n * m <= DENSE_LIMIT:
+        px, py = plate_centers[:, 0:1], plate_centers[:, 1:2]
+        inside = (zones[:, 0] <= px) & (px <= zones[:, 2]) & (zones[:, 1] <= py) & (py <= zones[:, 3])
+        return np.nonzero(inside)
+
+    cell = max(float(np.median(np.maximum(zones[:, 2] - zones[:, 0], zones[:, 3] - zones[:, 1]))), 1.0)
+    grid = {}
+    lo = np.floor(zones[:, :2] / cell).astype(int)
+    hi = np.floor(zones[:, 2:] / cell).astype(int)
+    for j in range(m):
+        for gx in range(lo[j, 0], hi[j, 0] + 1):
+            for gy in range(lo[j, 1], hi[j, 1] + 1):
+                grid.setdefault((gx, gy), []).append(j)
+    cells = np.floor(plate_centers / cell).astype(int)
+    pi, ri = [], []
+    for i, (gx, gy) in enumerate(cells.tolist()):
+        for j in grid.get((gx, gy), ()):
+            pi.append(i)
+            ri.append(j)
+    pi, ri = np.array(pi, np.int64), np.array(ri, np.int64)
+    c, z = plate_centers[pi], zones[ri]
+    keep = (z[:, 0] <= c[:, 0]) & (c[:, 0] <= z[:, 2]) & (z[:, 1] <= c[:, 1]) & (c[:, 1] <= z[:, 3])
+    return pi[keep], ri[keep]
+
+
+def pair_scores(plates, riders, zones, pi, ri):
+    """Score candidate pairs in [0, 1]: containment x horizontal alignment x below prior."""
+    p = plates[pi].astype(np.float32)
+    r = riders[ri].astype(np.float32)
+    z = zones[ri]
+
+    # Fraction of the plate inside the rider's zone
+    iw = np.clip(np.minimum(p[:, 2], z[:, 2]) - np.maximum(p[:, 0], z[:, 0]), 0, None)
+    ih = np.clip(np.minimum(p[:, 3], z[:, 3]) - np.maximum(p[:, 1], z[:, 1]), 0, None)
+    area = np.maximum((p[:, 2] - p[:, 0]) * (p[:, 3] - p[:, 1]), 1.0)
+    containment = iw * ih / area
+
+    # Plate centred under the rider rather than off to one side
+    pcx = (p[:, 0] + p[:, 2]) / 2
+    half = np.maximum((z[:, 2] - z[:, 0]) / 2, 1.0)
+    align = np.clip(1.0 - np.abs(pcx - (r[:, 0] + r[:, 2]) / 2) / half, 0.0, 1.0)
+
+    # Plates sit in the lower half of the rider box or below it
+    pcy = (p[:, 1] + p[:, 3]) / 2
+    rh = np.maximum(r[:, 3] - r[:, 1], 1.0)
+    below = np.clip((pcy - r[:, 1]) / (0.5 * rh), 0.0, 1.0)
+
+    return containment * (0.5 + 0.5 * align) * below
+
+
+def associate(plates, riders, min_score=0.1):
+    """Match plates to riders one-to-one. Returns [(plate index, rider index, score)].
+
+    plates and riders are N x 4 / M x 4 xyxy arrays. The assignment maximises
+    the total score (Hungarian algorithm when scipy is installed, otherwise
+    greedy best-first over the sorted candidate pairs, O(k log k)).
+    """
+    plates = np.asarray(plates).reshape(-1, 4)
+    riders = np.asarray(riders).reshape(-1, 4)
+    zones = rider_zones(riders)
+    centers = np.stack([(plates[:, 0] + plates[:, 2]) / 2, (plates[:, 1] + plates[:, 3]) / 2], axis=1)
+    pi, ri = candidate_pairs(centers, zones)
+    if len(pi) == 0:
+        return []
+    scores = pair_scores(plates, riders, zones, pi, ri)
+    keep = scores >= min_score
+    pi, ri, scores = pi[keep], ri[keep], scores[keep]
+    if len(pi) == 0:
+        return []
+
+    if linear_sum_assignment is not None:
+        # Only plates/riders that have a candidate take part, so the matrix stays small
+        plate_ids, pi_local = np.unique(pi, return_inverse=True)
+        rider_ids, ri_local = np.unique(ri, return_inverse=True)
+        cost = np.zeros((len(plate_ids), len(rider_ids)), np.float32)
+        cost[pi_local, ri_local] = -scores
+        rows, cols = linear_sum_assignment(cost)
+        matched = [(int(plate_ids[a]), int(rider_ids[b]), float(-cost[a, b])) for a, b in zip(rows, cols)]
+        return [m for m in matched if m[2] >= min_score]
+
+    matches = []
+    used_plates, used_riders = set(), set()
+    for k in np.argsort(-scores, kind="stable"):
+        i, j = int(pi[k]), int(ri[k])
+        if i not in used_plates and j not in used_riders:
+            used_plates.add(i)
+            used_riders.add(j)
+            matches.append((i, j, float(scores[k])))
+    return sorted(matches)
@@ -0,0 +1,101 @@
+import argparse
+import time
+import cv2
+from fused_detector import FusedDetector
+
+# Colours match IntegratedDetector in integrated_detector.py
+COLOR_NO_HELMET = (0, 0, 255)
+COLOR_HELMET = (0, 255, 0)
+COLOR_PLATE = (255, 0, 0)
+
+
+def find_violations(result):
+    """Pair plates with the no-helmet riders they belong to (see FusedResult.violations)."""
+    riders = result.without_helmet
+    return [{'rider': riders[j], 'plate': result.plates[i]} for i, j in result.violations()]
+
+
+def annotate(frame, result):
+    """Draw the fused detections onto frame in place."""
+    helmets, plates = result.helmets, result.plates
+    for (x1, y1, x2, y2), cls in zip(helmets.xyxy.tolist(), helmets.cls.tolist()):
+        color, text = (COLOR_NO_HELMET, "Helmet: NO") if cls == 1 else (COLOR_HELMET, "Helmet: YES")
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+        cv2.putText(frame, text, (x1, max(0, y1 - 10)), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    for (x1, y1, x2, y2), conf in zip(plates.xyxy.tolist(), plates.conf.tolist()):
+        cv2.rectangle(frame, (x1, y1), (x2, y2), COLOR_PLATE, 2)
+        cv2.putText(frame, f"Plate {conf:.2f}", (x1, max(0, y1 - 10)), cv2.FONT_HERSHEY_SIMPLEX, 0.6, COLOR_PLATE, 2)
+    return frame
+
+
+def read_batches(cap, batch_size):
+    """Decode frames ahead of inference and yield them in lists of batch_size."""
+    batch = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        batch.append(frame)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def process_video(path, detector, batch_size=8):
+    """Run batched detection over a video file.
+
+    Yields (frame_index, annotated_frame, violations) in decode order.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+
+    index = 0
+    try:
+        for batch in read_batches(cap, batch_size):
+            for frame, result in zip(batch, detector.detect_batch(batch)):
+                yield index, annotate(frame, result), find_violations(result)
+                index += 1
+    finally:
+        cap.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless batched helmet/plate detection for video files.")
+    parser.add_argument("video", help="input video file, e.g. output.avi")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--out", help="optional path for the annotated video")
+    args = parser.parse_args()
+
+    probe = cv2.VideoCapture(args.video)
+    fps = probe.get(cv2.CAP_PROP_FPS) or 30
+    probe.release()
+
+    detector = FusedDetector()
+    writer = None
+    total_violations = 0
+    start = time.time()
+    frames = 0
+
+    for index, annotated, violations in process_video(args.video, detector, args.batch_size):
+        frames += 1
+        if args.out:
+            if writer is None:
+                h, w = annotated.shape[:2]
+                writer = cv2.VideoWriter(args.out, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+            writer.write(annotated)
+        for v in violations:
+            total_violations += 1
+            print(f"[VIOLATION] frame {index} | rider {v['rider'].box} | plate {v['plate'].box}")
+
+    if writer:
+        writer.release()
+    elapsed = time.time() - start
+    print(f"Processed {frames} frames in {elapsed:.1f}s ({frames / max(elapsed, 1e-6):.1f} FPS), "
+          f"{total_violations} violations")
+
+
+if __name__ == "__main__":
+    main()
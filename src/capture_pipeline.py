@@ -0,0 +1,191 @@
+import queue
+import threading
+import time
+import cv2
+from frame_buffers import FramePool
+
+# Queue policies when inference is slower than the source
+DROP_OLDEST = "drop_oldest"  # discard the oldest queued frame to make room
+LATEST_ONLY = "latest"       # keep only the newest frame
+BLOCK = "block"              # wait for the consumer (no frames lost, e.g. video files)
+POLICIES = (DROP_OLDEST, LATEST_ONLY, BLOCK)
+LIVE_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://")
+
+
+class FrameGrabber:
+    """Reads a cv2.VideoCapture on its own thread into a bounded queue.
+
+    Exposes the same read()/isOpened()/release() calls as cv2.VideoCapture so it
+    can be dropped in wherever a capture object is used.
+
+    With pooled=True frames are decoded straight into a small FramePool
+    instead of a new array each time. A frame returned by read() is then only
+    valid until the next read(), which hands its buffer back to the pool.
+
+    Live sources (camera indices and network streams, or live=True) retry a
+    failed grab up to max_retries times, reopening the device every
+    reopen_every failures, before the stream is treated as ended; files end
+    on their first failed grab.
+    """
+
+    def __init__(self, source=0, maxsize=4, policy=DROP_OLDEST, pooled=False, live=None,
+                 max_retries=50, retry_delay=0.2, reopen_every=10):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.source = source
+        self.cap = source if isinstance(source, cv2.VideoCapture) else cv2.VideoCapture(source)
+        if live is None:
+            live = isinstance(source, int) or (isinstance(source, str) and source.lower().startswith(LIVE_PREFIXES))
+        self.live = live
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.reopen_every = reopen_every
+        self.policy = policy
+        self.frames = queue.Queue(maxsize=1 if policy == LATEST_ONLY else maxsize)
+        self.pooled = pooled
+        self.pool = None      # created from the first frame's size
+        self._held = None     # buffer of the frame last returned by read()
+
+        # Counters
+        self.captured = 0
+        self.dropped = 0
+        self.consumed = 0
+        self.retries = 0
+
+        self._stop = threading.Event()
+        self._finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            ret, frame, buf = self._grab()
+            if not ret:
+                if self._stop.is_set() or not self.live or failures >= self.max_retries:
+                    break
+                # Transient camera/network stall: wait, and reopen the device now and then
+                failures += 1
+                self.retries += 1
+                print(f"Capture read failed ({failures}/{self.max_retries}), retrying...")
+                time.sleep(self.retry_delay)
+                if failures % self.reopen_every == 0:
+                    self._reopen()
+                continue
+            failures = 0
+            self.captured += 1
+            self._put((frame, buf))
+        self._finished.set()
+
+    def _reopen(self):
+        if isinstance(self.source, cv2.VideoCapture):
+            return  # caller's capture object: nothing to reopen from
+        self.cap.release()
+        self.cap = cv2.VideoCapture(self.source)
+
+    def _grab(self):
+        """Read one frame, into a pooled buffer when possible. Returns (ret, frame, buffer)."""
+        if self.pool is None:
+            ret, frame = self.cap.read()
+            if ret and self.pooled:
+                # queue + producer + consumer, with one spare
+                self.pool = FramePool(frame.nbytes, count=self.frames.maxsize + 3)
+                self._frame_shape = frame.shape
+            return ret, frame, None
+
+        buf = None
+        while buf is None and not self._stop.is_set():
+            buf = self.pool.acquire(self._frame_shape, timeout=0.1)
+        if buf is None:
+            return False, None, None
+        ret, frame = self.cap.read(buf.array)
+        if ret and frame is buf.array:
+            return ret, frame, buf
+        buf.release()  # failed read or the source changed size
+        return ret, frame, None
+
+    @staticmethod
+    def _drop(item):
+        if item[1] is not None:
+            item[1].release()
+
+    def _put(self, item):
+        if self.policy == BLOCK:
+            while not self._stop.is_set():
+                try:
+                    self.frames.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            self._drop(item)
+            return
+
+        # drop_oldest / latest: make room instead of waiting
+        while True:
+            try:
+                self.frames.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._drop(self.frames.get_nowait())
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def read(self, timeout=None):
+        """Return (ret, frame) like cv2.VideoCapture.read().
+
+        Blocks until a frame arrives or the source has ended, like a plain
+        VideoCapture; a timeout in seconds bounds the wait and timeout=0 never
+        waits. ret is False only when no frame could be returned.
+        """
+        if timeout is not None and timeout <= 0:
+            try:
+                return self._hand_out(self.frames.get_nowait())
+            except queue.Empty:
+                return False, None
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            try:
+                return self._hand_out(self.frames.get(timeout=0.05))
+            except queue.Empty:
+                if self._finished.is_set() and self.frames.empty():
+                    return False, None
+                if deadline is not None and time.time() >= deadline:
+                    return False, None
+
+    def _hand_out(self, item):
+        frame, buf = item
+        if self._held is not None:
+            self._held.release()
+        self._held = buf
+        self.consumed += 1
+        return True, frame
+
+    @property
+    def finished(self):
+        """True once the source has ended (or failed) and every queued frame was read."""
+        return self._finished.is_set() and self.frames.empty()
+
+    def isOpened(self):
+        return self.cap.isOpened() and not (self._finished.is_set() and self.frames.empty())
+
+    def stats(self):
+        stats = {
+            'captured': self.captured,
+            'dropped': self.dropped,
+            'consumed': self.consumed,
+            'retries': self.retries,
+            'queued': self.frames.qsize(),
+        }
+        if self.pool:
+            stats['buffers'] = self.pool.stats()
+        return stats
+
+    def release(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self.cap.release()
+        if self._held is not None:
+            self._held.release()
+            self._held = None
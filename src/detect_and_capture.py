@@ -1,19 +1,27 @@
 import cv2
 import os
 from ultralytics import YOLO
+from fused_detector import CascadeDetector
 import easyocr
 from datetime import datetime
+from plate_ocr import PlateRecognizer
+from evidence_writer import EvidenceWriter
+from motion_detector import MotionGate
 
 # Models
 helmet_model = YOLO("Weights/best.pt")      # your helmet detection
 plate_model = YOLO("Weights/plate.pt")      # downloaded license plate detector
-ocr = easyocr.Reader(['en'], gpu=False)
+ocr = PlateRecognizer(easyocr.Reader(['en'], gpu=False))  # recognizer-only fast path
+# Plates are searched (batched) only in padded ROIs around riders without a helmet
+engine = CascadeDetector(helmet_model=helmet_model, plate_model=plate_model, roi_pad=(50, 20, 50, 50))
+evidence = EvidenceWriter()  # JPEG encoding off the camera loop
 
 # Output folder
 os.makedirs("captures", exist_ok=True)
 
 def detect_from_camera():
     cap = cv2.VideoCapture(0)
+    gate = MotionGate()
 
     while True:
         ret, frame = cap.read()
@@ -21,34 +29,30 @@ def detect_from_camera():
             print("Camera error.")
             break
 
-        # --- HELMET DETECTION ---
-        helmet_results = helmet_model(frame)
+        # --- MOTION GATE --- (empty road: skip both models)
+        if not gate.should_run(frame):
+            cv2.imshow("Frame", frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+            continue
 
-        for r in helmet_results:
-            for box in r.boxes:
-                cls = int(box.cls)
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
+        # --- HELMET DETECTION + LICENSE PLATE DETECTION around class 1 (Without Helmet) ---
+        result = engine.detect(frame)
 
-                # class 1 = Without Helmet
-                if cls == 1:
-                    roi = frame[max(0, y1-20):y2+50, max(0, x1-50):x2+50]
+        crops = []
+        for px1, py1, px2, py2 in result.plates.boxes():
+            plate_crop = frame[py1:py2, px1:px2]
+            if plate_crop.size:
+                crops.append(plate_crop)
 
-                    # --- LICENSE PLATE DETECTION ---
-                    plate_results = plate_model(roi)
-
-                    for p in plate_results:
-                        for pb in p.boxes:
-                            px1, py1, px2, py2 = map(int, pb.xyxy[0])
-                            plate_crop = roi[py1:py2, px1:px2]
-
-                            # --- OCR ---
-                            ocr_result = ocr.readtext(plate_crop)
-                            if len(ocr_result) > 0:
-                                text = ocr_result[0][1]
-                                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                save_path = f"captures/{text}_{timestamp}.jpg"
-                                cv2.imwrite(save_path, plate_crop)
-                                print("Captured →", text, "→", save_path)
+        # --- OCR --- (all plates of the frame in one read_batch call)
+        for plate_crop, ocr_result in zip(crops, ocr.read_batch(crops)):
+            if len(ocr_result) > 0:
+                text = ocr_result[0][1]
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                save_path = f"captures/{text}_{timestamp}.jpg"
+                evidence.write_image(save_path, plate_crop)
+                print("Captured →", text, "→", save_path)
 
         cv2.imshow("Frame", frame)
         if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -56,6 +60,8 @@ def detect_from_camera():
 
     cap.release()
     cv2.destroyAllWindows()
+    evidence.close()
+    print("Motion gate:", gate.stats())
 
 if __name__ == "__main__":
     detect_from_camera()
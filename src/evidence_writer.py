@@ -0,0 +1,130 @@
+import csv
+import queue
+import threading
+import time
+import cv2
+
+
+class EvidenceWriter:
+    """Encodes and writes evidence images (and CSV rows) on background threads.
+
+    Callers hand over a frame and return immediately; the frame is copied so
+    they can keep drawing on it. When the queue is full the writer either
+    blocks the caller (default, nothing is lost) or drops the job if
+    drop_when_full is set. Either way the stats() counters show the pressure.
+    After close() jobs are written synchronously on the caller's thread.
+    """
+
+    def __init__(self, workers=1, maxsize=128, jpeg_quality=90, drop_when_full=False):
+        self.jpeg_quality = jpeg_quality
+        self.drop_when_full = drop_when_full
+        self.jobs = queue.Queue(maxsize=maxsize)
+
+        # Backpressure metrics
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.blocked_seconds = 0.0
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = []
+        for i in range(workers):
+            t = threading.Thread(target=self._run, name=f"evidence-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def write_image(self, path, image):
+        """Queue image to be JPEG-encoded to path. Returns path (or None if dropped)."""
+        return path if self._submit(self._encode, path, image.copy()) else None
+
+    def append_csv(self, path, row):
+        """Queue one CSV row append."""
+        return self._submit(self._append_row, path, list(row))
+
+    def submit(self, fn, *args):
+        """Queue an arbitrary write job."""
+        return self._submit(fn, *args)
+
+    def _submit(self, fn, *args):
+        if self._closed:
+            # No workers left to drain the queue: write now instead of blocking or dropping
+            with self._lock:
+                self.submitted += 1
+            return self._execute(fn, args)
+        job = (fn, args)
+        if self.drop_when_full:
+            try:
+                self.jobs.put_nowait(job)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+                return False
+        else:
+            start = time.time()
+            self.jobs.put(job)
+            waited = time.time() - start
+            with self._lock:
+                self.blocked_seconds += waited
+        with self._lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self.jobs.qsize())
+        return True
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+            try:
+                self._execute(*job)
+            finally:
+                self.jobs.task_done()
+
+    def _execute(self, fn, args):
+        try:
+            fn(*args)
+            with self._lock:
+                self.written += 1
+            return True
+        except Exception as e:
+            print("Evidence write error:", e)
+            with self._lock:
+                self.errors += 1
+            return False
+
+    def _encode(self, path, image):
+        if not cv2.imwrite(path, image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]):
+            raise IOError(f"cv2.imwrite failed for {path}")
+
+    def _append_row(self, path, row):
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(row)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': self.jobs.qsize(),
+                'submitted': self.submitted,
+                'written': self.written,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'max_depth': self.max_depth,
+                'blocked_seconds': round(self.blocked_seconds, 3),
+            }
+
+    def flush(self):
+        """Wait until every queued job has been written."""
+        self.jobs.join()
+
+    def close(self):
+        """Flush outstanding writes and stop the worker threads."""
+        self._closed = True
+        self.flush()
+        for _ in self._threads:
+            self.jobs.put(None)
+        for t in self._threads:
+            t.join(timeout=5.0)
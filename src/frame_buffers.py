@@ -0,0 +1,103 @@
+import threading
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class FrameBuffer:
+    """One preallocated buffer of a FramePool with a single owner.
+
+    `array` is a view with the shape the buffer was acquired for. The buffer
+    goes back to its pool when its owner calls release(); a second release()
+    is an error.
+    """
+    __slots__ = ("pool", "index", "array", "in_use")
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+        self.array = None
+        self.in_use = False
+
+    def release(self):
+        self.pool._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class FramePool:
+    """Fixed set of frame buffers reused instead of allocating one per frame.
+
+    Every buffer holds up to `nbytes`; acquire(shape) hands out a free one as
+    an array of that shape (so frames of any size up to nbytes fit). With
+    shared=True the buffers live in multiprocessing.shared_memory segments,
+    which other processes can attach to by name (see inference_pool.py).
+    """
+
+    def __init__(self, nbytes, count=8, shared=False):
+        self.nbytes = nbytes
+        self.shared = shared
+        if shared:
+            self.shms = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(count)]
+            self._memory = [shm.buf for shm in self.shms]
+        else:
+            self.shms = []
+            self._memory = [np.empty(nbytes, dtype=np.uint8) for _ in range(count)]
+        self.buffers = [FrameBuffer(self, i) for i in range(count)]
+        self._free = list(range(count))
+        self._cond = threading.Condition()
+        self.waits = 0  # acquire() calls that found no free buffer
+
+    @property
+    def names(self):
+        """Shared-memory segment names, in buffer index order."""
+        return [shm.name for shm in self.shms]
+
+    @property
+    def in_use(self):
+        return len(self.buffers) - len(self._free)
+
+    def acquire(self, shape, dtype=np.uint8, timeout=None):
+        """Return a FrameBuffer viewed as `shape`, or None after timeout.
+
+        timeout=None waits for a buffer to be released; timeout=0 never waits.
+        """
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if size > self.nbytes:
+            raise ValueError(f"Frame of {size} bytes exceeds buffer size {self.nbytes}")
+        with self._cond:
+            if not self._free:
+                self.waits += 1
+                if timeout is not None and timeout <= 0:
+                    return None
+                if not self._cond.wait_for(lambda: self._free, timeout):
+                    return None
+            buf = self.buffers[self._free.pop()]
+            buf.in_use = True
+        buf.array = np.ndarray(shape, dtype=dtype, buffer=self._memory[buf.index])
+        return buf
+
+    def _release(self, buf):
+        with self._cond:
+            if not buf.in_use:
+                raise RuntimeError(f"Frame buffer {buf.index} released more often than acquired")
+            buf.in_use = False
+            buf.array = None
+            self._free.append(buf.index)
+            self._cond.notify()
+
+    def stats(self):
+        return {'buffers': len(self.buffers), 'in_use': self.in_use, 'waits': self.waits}
+
+    def close(self):
+        """Free shared-memory segments. Views into them must no longer be used."""
+        for buf in self.buffers:
+            buf.array = None
+        self._memory = []
+        for shm in self.shms:
+            shm.close()
+            shm.unlink()
+        self.shms = []
@@ -0,0 +1,160 @@
+import math
+import time
+from contextlib import contextmanager
+import cv2
+import numpy as np
+
+
+class AdaptiveScheduler:
+    """Chooses how often to run detection from measured per-stage latency.
+
+    Detection runs on every Nth frame; frames in between only move the last
+    detections along with the image (BoxPropagator, the "track" stage), which
+    is far cheaper. After each frame the smoothed stage costs are used to pick
+    the smallest N whose average cost per frame fits the target FPS budget:
+
+        (detect + (N - 1) * track) / N <= 1 / target_fps
+
+    The same config therefore runs every frame on a fast machine and backs off
+    on a slow one. metrics() exposes N, achieved FPS and stage latencies.
+    """
+
+    def __init__(self, target_fps=15.0, min_n=1, max_n=10, alpha=0.2):
+        self.target_fps = target_fps
+        self.budget = 1.0 / target_fps
+        self.min_n = min_n
+        self.max_n = max_n
+        self.alpha = alpha
+
+        self.n = min_n
+        self.latency = {}  # stage -> smoothed seconds
+        self.fps = 0.0
+        self.frames = 0
+        self._since_detect = 0
+        self._frame_start = None
+        self._last_frame_end = None
+
+    def should_detect(self):
+        """Call once per frame: True if this frame should run detection."""
+        self._frame_start = time.perf_counter()
+        run = self._since_detect == 0
+        self._since_detect = (self._since_detect + 1) % self.n
+        return run
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage: `with scheduler.stage("detect"): ...`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        prev = self.latency.get(name)
+        self.latency[name] = seconds if prev is None else prev + self.alpha * (seconds - prev)
+
+    def frame_done(self):
+        """Call at the end of every frame to update FPS and re-pick N."""
+        now = time.perf_counter()
+        if self._last_frame_end is not None:
+            dt = now - self._last_frame_end
+            if dt > 0:
+                self.fps = 1.0 / dt if not self.fps else self.fps + self.alpha * (1.0 / dt - self.fps)
+        self._last_frame_end = now
+        self.frames += 1
+
+        detect = self.latency.get("detect")
+        if detect is None:
+            return
+        track = self.latency.get("track", 0.0)
+        if detect <= self.budget:
+            n = self.min_n
+        elif track >= self.budget:
+            n = self.max_n  # even tracking misses the budget; detect as rarely as allowed
+        else:
+            n = math.ceil((detect - track) / (self.budget - track))
+        new_n = max(self.min_n, min(self.max_n, n))
+        if new_n != self.n:
+            self.n = new_n
+            self._since_detect %= self.n
+
+    def delay(self):
+        """Seconds to wait before the next frame so output FPS does not exceed the target."""
+        if self._frame_start is None:
+            return 0.0
+        return max(0.0, self.budget - (time.perf_counter() - self._frame_start))
+
+    def delay_ms(self):
+        """delay() in whole milliseconds (at least 1) for Tk's after()."""
+        return max(1, int(self.delay() * 1000))
+
+    def metrics(self):
+        return {
+            'n': self.n,
+            'target_fps': self.target_fps,
+            'achieved_fps': round(self.fps, 1),
+            'latency_ms': {k: round(v * 1000, 1) for k, v in self.latency.items()},
+        }
+
+
+class BoxPropagator:
+    """Carries the last detected boxes across the frames between detections.
+
+    seed() samples corner features inside each box of a detected frame;
+    step() follows them into the next frame with pyramidal Lucas-Kanade
+    optical flow and shifts every box by the median motion of its points.
+    Flow runs on a grayscale copy downscaled by `scale`. A box whose points
+    are all lost stays where it was.
+    """
+
+    def __init__(self, max_points=20, scale=0.5):
+        self.max_points = max_points
+        self.scale = scale
+        self.prev = None
+        self.boxes = np.zeros((0, 4), np.float32)
+        self.points = np.zeros((0, 1, 2), np.float32)
+        self.owners = np.zeros(0, np.int32)
+
+    def prepare(self, frame):
+        """Small grayscale copy of frame; take it before anything is drawn on the frame."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+    def seed(self, gray, boxes):
+        """Start following boxes (x1, y1, x2, y2 in frame coordinates) from a prepare()d frame."""
+        self.prev = gray
+        self.boxes = np.array(boxes, np.float32).reshape(-1, 4)
+        points, owners = [], []
+        for k, box in enumerate((self.boxes * self.scale).astype(int).tolist()):
+            x1, y1, x2, y2 = box
+            roi = gray[max(0, y1):max(0, y2), max(0, x1):max(0, x2)]
+            found = None
+            if roi.shape[0] >= 3 and roi.shape[1] >= 3:
+                found = cv2.goodFeaturesToTrack(roi, self.max_points, 0.01, 3)
+            if found is None:
+                found = np.array([[[(x2 - x1) / 2, (y2 - y1) / 2]]], np.float32)  # fall back to the centre
+            points.append(found.reshape(-1, 1, 2) + np.float32([max(0, x1), max(0, y1)]))
+            owners += [k] * len(found)
+        self.points = np.concatenate(points).astype(np.float32) if points else np.zeros((0, 1, 2), np.float32)
+        self.owners = np.array(owners, np.int32)
+
+    def step(self, frame):
+        """Move the boxes to frame and return them as (x1, y1, x2, y2) int tuples."""
+        if self.prev is None or not len(self.points):
+            return [tuple(int(v) for v in b) for b in self.boxes.tolist()]
+        gray = self.prepare(frame)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self.prev, gray, self.points, None,
+                                                    winSize=(15, 15), maxLevel=2)
+        ok = status.ravel() == 1
+        motion = (moved - self.points).reshape(-1, 2) / self.scale
+        for k in range(len(self.boxes)):
+            sel = ok & (self.owners == k)
+            if sel.any():
+                dx, dy = np.median(motion[sel], axis=0)
+                self.boxes[k] += (dx, dy, dx, dy)
+        h, w = frame.shape[:2]
+        self.boxes[:, [0, 2]] = self.boxes[:, [0, 2]].clip(0, w)
+        self.boxes[:, [1, 3]] = self.boxes[:, [1, 3]].clip(0, h)
+        self.points, self.owners, self.prev = moved[ok], self.owners[ok], gray
+        return [tuple(int(v) for v in b) for b in self.boxes.tolist()]
@@ -0,0 +1,273 @@
+import cv2
+import numpy as np
+import torch
+from association import associate
+from inference_backend import load_model
+
+HELMET_CLASSES = ['With Helmet', 'Without Helmet']
+
+
+def letterbox(img, size=640, color=(114, 114, 114)):
+    """Resize img onto a size x size canvas keeping aspect ratio.
+
+    Returns the canvas, the scale ratio and the (pad_x, pad_y) offsets so boxes
+    can be mapped back to the original frame.
+    """
+    h, w = img.shape[:2]
+    r = min(size / h, size / w)
+    new_w, new_h = int(round(w * r)), int(round(h * r))
+    pad_x = (size - new_w) // 2
+    pad_y = (size - new_h) // 2
+
+    canvas = np.full((size, size, 3), color, dtype=np.uint8)
+    if (new_w, new_h) != (w, h):
+        img = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = img
+    return canvas, r, (pad_x, pad_y)
+
+
+def to_tensor(images):
+    """Stack letterboxed BGR images into one normalized RGB BCHW tensor."""
+    batch = np.stack(images)[..., ::-1].transpose(0, 3, 1, 2)
+    return torch.from_numpy(np.ascontiguousarray(batch)).float().div_(255.0)
+
+
+class Detection:
+    """One class-tagged box in original frame coordinates (a row of Detections)."""
+    __slots__ = ("source", "cls", "label", "conf", "box")
+
+    def __init__(self, source, cls, label, conf, box):
+        self.source = source  # "helmet" or "plate"
+        self.cls = cls
+        self.label = label
+        self.conf = conf
+        self.box = box  # (x1, y1, x2, y2) ints
+
+    def __repr__(self):
+        return f"Detection({self.source}, {self.label}, {self.conf:.2f}, {self.box})"
+
+
+class Detections:
+    """All boxes of one model for one frame as contiguous NumPy arrays.
+
+    xyxy (N x 4 int32, frame coordinates), conf (N float32) and cls (N int32)
+    are pulled from the model output once per frame, so filtering, selection
+    and association are array operations. Iterating yields Detection records
+    for code that wants one object per box.
+    """
+    __slots__ = ("source", "names", "xyxy", "conf", "cls")
+
+    def __init__(self, source, names, xyxy=None, conf=None, cls=None):
+        self.source = source
+        self.names = names
+        self.xyxy = np.zeros((0, 4), np.int32) if xyxy is None else xyxy
+        self.conf = np.zeros(0, np.float32) if conf is None else conf
+        self.cls = np.zeros(0, np.int32) if cls is None else cls
+
+    @classmethod
+    def from_result(cls, result, source, names, r, pad, shape, offset=(0, 0)):
+        """Map a model's boxes from letterbox space (of a crop at offset) back to the frame."""
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return cls(source, names)
+        data = boxes.data.cpu().numpy()  # x1, y1, x2, y2, [track id,] conf, cls in one transfer
+        xyxy = data[:, :4].copy()
+        xyxy[:, [0, 2]] = (xyxy[:, [0, 2]] - pad[0]) / r + offset[0]
+        xyxy[:, [1, 3]] = (xyxy[:, [1, 3]] - pad[1]) / r + offset[1]
+        h, w = shape[:2]
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, w)
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, h)
+        return cls(source, names, xyxy.astype(np.int32), data[:, -2].astype(np.float32), data[:, -1].astype(np.int32))
+
+    @classmethod
+    def concat(cls, parts, source, names):
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls(source, names)
+        return cls(source, names, np.concatenate([p.xyxy for p in parts]),
+                   np.concatenate([p.conf for p in parts]), np.concatenate([p.cls for p in parts]))
+
+    def __len__(self):
+        return len(self.conf)
+
+    def __getitem__(self, i):
+        c = int(self.cls[i])
+        return Detection(self.source, c, self.names[c], float(self.conf[i]), tuple(int(v) for v in self.xyxy[i]))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def select(self, index):
+        """Subset by boolean mask or index array."""
+        return Detections(self.source, self.names, self.xyxy[index], self.conf[index], self.cls[index])
+
+    def above(self, conf):
+        return self.select(self.conf >= conf)
+
+    def of_class(self, c):
+        return self.select(self.cls == c)
+
+    def best(self):
+        """Highest confidence Detection, or None."""
+        return self[int(self.conf.argmax())] if len(self) else None
+
+    def centers(self):
+        return (self.xyxy[:, :2] + self.xyxy[:, 2:]) // 2
+
+    def boxes(self):
+        """Boxes as (x1, y1, x2, y2) int tuples, e.g. for the trackers."""
+        return [tuple(b) for b in self.xyxy.tolist()]
+
+
+class FusedResult:
+    """Merged helmet + plate detections for a single frame."""
+
+    def __init__(self, helmets, plates):
+        self.helmets = helmets  # Detections
+        self.plates = plates    # Detections
+
+    @property
+    def detections(self):
+        """All detections as Detection records, helmets first."""
+        return list(self.helmets) + list(self.plates)
+
+    @property
+    def without_helmet(self):
+        return self.helmets.of_class(1)
+
+    def best_helmet(self):
+        """Return the highest confidence helmet detection, or None."""
+        return self.helmets.best()
+
+    def violations(self):
+        """(plate index, rider index into without_helmet) for each plate matched to a no-helmet rider.
+
+        Plates and riders are paired one-to-one by association.associate(), which
+        favours plates contained in, centred under and below the rider box.
+        """
+        return [(i, j) for i, j, _ in associate(self.plates.xyxy, self.without_helmet.xyxy)]
+
+
+class FusedDetector:
+    """Runs the helmet and plate models off one shared preprocessed tensor.
+
+    The frame is letterboxed and normalized once; both YOLO models receive the
+    same tensor so ultralytics skips its own per-model letterbox/normalize.
+    backend picks the runtime ("torch", "onnx" or "openvino", see
+    inference_backend.py); exported weights are found next to the .pt files.
+    conf and iou are the YOLO confidence and NMS thresholds (see
+    inference_profiles.py for bundled settings).
+    """
+
+    def __init__(self, helmet_model_path="Weights/best.pt", plate_model_path="Weights/plate.pt",
+                 imgsz=640, helmet_model=None, plate_model=None, backend="torch", conf=0.25, iou=0.7):
+        self.backend = backend
+        self.conf = conf
+        self.iou = iou
+        self.helmet_model = helmet_model or load_model(helmet_model_path, backend)
+        self.plate_model = plate_model or load_model(plate_model_path, backend)
+        self.imgsz = imgsz
+
+    def detect(self, frame):
+        """Detect helmets and plates in a BGR frame and return a FusedResult."""
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames):
+        """Detect helmets and plates in a list of BGR frames with one call per model.
+
+        Frames are letterboxed into a single BCHW batch, so the per-call overhead
+        is paid once per batch instead of once per frame. Results keep input order.
+        """
+        if not frames:
+            return []
+        letterboxed = [letterbox(frame, self.imgsz) for frame in frames]
+        tensor = to_tensor([canvas for canvas, _, _ in letterboxed])
+
+        helmet_results = self.helmet_model(tensor, verbose=False, conf=self.conf, iou=self.iou)
+        plate_results = self.plate_model(tensor, verbose=False, conf=self.conf, iou=self.iou)
+
+        fused = []
+        for frame, (_, r, pad), helmet_res, plate_res in zip(frames, letterboxed, helmet_results, plate_results):
+            fused.append(FusedResult(
+                Detections.from_result(helmet_res, "helmet", HELMET_CLASSES, r, pad, frame.shape),
+                Detections.from_result(plate_res, "plate", self.plate_model.names, r, pad, frame.shape)))
+        return fused
+
+
+def expand_box(box, pad, shape):
+    """Grow box by pad = (left, top, right, bottom) pixels, clipped to the frame."""
+    x1, y1, x2, y2 = box
+    left, top, right, bottom = pad
+    h, w = shape[:2]
+    return (max(0, x1 - left), max(0, y1 - top), min(w, x2 + right), min(h, y2 + bottom))
+
+
+def merge_boxes(boxes):
+    """Union overlapping boxes until none overlap, so shared regions are searched once."""
+    boxes = list(boxes)
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        for box in boxes:
+            for i, other in enumerate(out):
+                if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                    out[i] = (min(box[0], other[0]), min(box[1], other[1]),
+                              max(box[2], other[2]), max(box[3], other[3]))
+                    merged = True
+                    break
+            else:
+                out.append(box)
+        boxes = out
+    return boxes
+
+
+class CascadeDetector(FusedDetector):
+    """Helmet model first, then the plate model only around riders without a helmet.
+
+    Each no-helmet box is padded by roi_pad = (left, top, right, bottom) pixels
+    (the plate sits below the rider, hence the larger bottom pad), overlapping
+    ROIs are merged, and all ROIs of all frames go through the plate model as
+    one batch at roi_imgsz. Frames without a violating rider never touch the
+    plate model.
+    """
+
+    def __init__(self, helmet_model_path="Weights/best.pt", plate_model_path="Weights/plate.pt",
+                 imgsz=640, helmet_model=None, plate_model=None, roi_pad=(50, 20, 50, 50), roi_imgsz=320,
+                 backend="torch", conf=0.25, iou=0.7):
+        super().__init__(helmet_model_path, plate_model_path, imgsz, helmet_model, plate_model, backend, conf, iou)
+        self.roi_pad = roi_pad
+        self.roi_imgsz = roi_imgsz
+        self.plate_calls = 0    # batched plate model calls
+        self.plate_frames = 0   # frames that had at least one ROI
+        self.frames_seen = 0
+
+    def detect_batch(self, frames):
+        if not frames:
+            return []
+        letterboxed = [letterbox(frame, self.imgsz) for frame in frames]
+        helmet_results = self.helmet_model(to_tensor([canvas for canvas, _, _ in letterboxed]), verbose=False,
+                                           conf=self.conf, iou=self.iou)
+
+        helmets = []
+        rois = []  # (frame index, (x1, y1, x2, y2))
+        for i, (frame, (_, r, pad), helmet_res) in enumerate(zip(frames, letterboxed, helmet_results)):
+            dets = Detections.from_result(helmet_res, "helmet", HELMET_CLASSES, r, pad, frame.shape)
+            helmets.append(dets)
+            riders = [expand_box(box, self.roi_pad, frame.shape) for box in dets.of_class(1).boxes()]
+            rois += [(i, roi) for roi in merge_boxes(riders) if roi[2] > roi[0] and roi[3] > roi[1]]
+        self.frames_seen += len(frames)
+
+        plates = [[] for _ in frames]
+        if rois:
+            self.plate_calls += 1
+            self.plate_frames += len({i for i, _ in rois})
+            crops = [letterbox(frames[i][y1:y2, x1:x2], self.roi_imgsz) for i, (x1, y1, x2, y2) in rois]
+            plate_results = self.plate_model(to_tensor([canvas for canvas, _, _ in crops]), verbose=False,
+                                             conf=self.conf, iou=self.iou)
+            for (i, roi), (_, r, pad), plate_res in zip(rois, crops, plate_results):
+                plates[i].append(Detections.from_result(plate_res, "plate", self.plate_model.names, r, pad,
+                                                        frames[i].shape, offset=roi[:2]))
+
+        names = self.plate_model.names
+        return [FusedResult(h, Detections.concat(p, "plate", names)) for h, p in zip(helmets, plates)]
@@ -1,10 +1,11 @@
 import tkinter as tk
-from tkinter import Button, Label, Frame, Scrollbar, Canvas, filedialog
+from tkinter import Button, Label, Frame, filedialog
 from PIL import Image, ImageTk
 import cv2
-import os
 from helmet_detector import HelmetDetector
-import time  # <-- Add this import
+from ring_recorder import RingRecorder
+from log_viewer import LogViewer
+from frame_scheduler import AdaptiveScheduler
 
 class App:
     def __init__(self, window):
@@ -16,6 +17,13 @@ class App:
         # Helmet detector
         self.detector = HelmetDetector()
 
+        # Last few seconds of annotated frames; written to logs/ only around violations
+        self.recorder = RingRecorder(self.detector.evidence, folder="logs", rgb=True)
+        self.detector.on_violation = self.on_violation
+
+        # Picks how often to run detection so the display keeps ~15 FPS
+        self.scheduler = AdaptiveScheduler(target_fps=15)
+
         # Pages
         self.pages = {}
         self.create_detection_page()
@@ -63,21 +71,11 @@ class App:
         frame = Frame(self.window)
         self.pages["logs"] = frame
 
-        # Canvas + Scrollbar for images
-        canvas = Canvas(frame, width=850, height=600)
-        canvas.pack(side="left", fill="both", expand=True)
-
-        scrollbar = Scrollbar(frame, orient="vertical", command=canvas.yview)
-        scrollbar.pack(side="right", fill="y")
-
-        canvas.configure(yscrollcommand=scrollbar.set)
-        canvas.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-
-        self.logs_frame = Frame(canvas)
-        canvas.create_window((0, 0), window=self.logs_frame, anchor="nw")
-
         # Refresh button
-        Button(frame, text="Refresh Logs", command=self.load_logs).pack(pady=5)
+        Button(frame, text="Refresh Logs", command=self.load_logs).pack(side="top", pady=5)
+
+        # Virtualized thumbnail grid: only visible thumbnails are decoded
+        self.log_viewer = LogViewer(frame, folder="logs")
 
     # -----------------------------
     # Navigation
@@ -105,6 +103,7 @@ class App:
             self.update_frame()
 
     def stop(self):
+        print("[SCHEDULER]", self.scheduler.metrics())
         if hasattr(self, 'cap'):
             self.cap.release()
         self.detector.running = False
@@ -112,13 +111,20 @@ class App:
 
     def update_frame(self):
         if self.running:
+            # Detect every Nth frame (N adapted to the measured latency), track in between.
+            # Frames are read outside the timed stages so camera waits don't count as latency.
             if hasattr(self, 'cap') and self.cap.isOpened():  # Process video
                 ret, frame = self.cap.read()
                 if ret and frame is not None:
                     frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
                     # Process frame using the detector
-                    frame = self.detector.detect(frame)  # Use the detect method from HelmetDetector
+                    detect = self.scheduler.should_detect()
+                    with self.scheduler.stage("detect" if detect else "track"):
+                        if detect:
+                            frame = self.detector.detect(frame)  # Use the detect method from HelmetDetector
+                        else:
+                            frame = self.detector.draw_last(frame)
                     frame = self.resize_frame(frame)  # Resize the frame to fit window
 
                     img = Image.fromarray(frame)
@@ -134,8 +140,16 @@ class App:
                     self.stop_video()  # Stop if video ends or no frame is available
 
             else:  # Process webcam feed for helmet detection
-                frame = self.detector.get_frame()  # Get the frame from webcam
+                # Short wait so a stalled camera never freezes the UI; retried next tick
+                frame = self.detector.read_frame(timeout=0.05)
+                if frame is None and self.detector.cap.finished:
+                    print("Webcam stream ended.")
+                    self.stop()
+                    return
                 if frame is not None:
+                    detect = self.scheduler.should_detect()
+                    with self.scheduler.stage("detect" if detect else "track"):
+                        frame = self.detector.process_frame(frame, detect=detect)
                     frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                     frame = self.resize_frame(frame)  # Resize the frame to fit window
                     img = Image.fromarray(frame)
@@ -146,7 +160,8 @@ class App:
                     # Save the processed webcam frame for logs
                     self.save_log_frame(frame)
 
-            self.window.after(30, self.update_frame)
+            self.scheduler.frame_done()
+            self.window.after(self.scheduler.delay_ms(), self.update_frame)
 
     def resize_frame(self, frame):
         """Resize the frame to fit within the window."""
@@ -174,13 +189,13 @@ class App:
         return resized_frame
 
     def save_log_frame(self, frame):
-        """Save the processed frame for logs."""
+        """Keep the processed (RGB) frame in the in-memory ring buffer for violation clips."""
         if frame is not None:
-            save_path = "logs"
-            os.makedirs(save_path, exist_ok=True)
-            filename = os.path.join(save_path, f"frame_{int(time.time())}.jpg")
-            cv2.imwrite(filename, frame)
-            print(f"Saved frame to log: {filename}")
+            self.recorder.push(frame)
+
+    def on_violation(self, violation_info):
+        """Write the buffered pre/post context of a violation as one clip in logs/."""
+        self.recorder.trigger("violation")
 
     # -----------------------------
     # Image and Video Upload
@@ -230,22 +245,7 @@ class App:
     # Logs
     # -----------------------------
     def load_logs(self):
-        # Clear previous images
-        for widget in self.logs_frame.winfo_children():
-            widget.destroy()
-
-        folder = "logs"  # Logs folder
-        if not os.path.exists(folder):
-            return
-
-        images = sorted(os.listdir(folder), reverse=True)
-        for img_file in images:
-            img_path = os.path.join(folder, img_file)
-            pil_img = Image.open(img_path).resize((300, 200))
-            imgtk = ImageTk.PhotoImage(pil_img)
-            lbl = Label(self.logs_frame, image=imgtk)
-            lbl.image = imgtk
-            lbl.pack(padx=5, pady=5)
+        self.log_viewer.refresh()
 
     # -----------------------------
     # Close
@@ -253,6 +253,9 @@ class App:
     def on_close(self):
         if hasattr(self, 'cap'):
             self.cap.release()
+        # Last violations trigger clips, so they are flushed before the recorder
+        self.detector.finish()
+        self.recorder.flush()
         self.detector.release()
         self.window.destroy()
 
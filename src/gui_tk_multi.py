@@ -6,7 +6,8 @@ import cv2
 import threading
 import os
 import time
-from helmet_detector import IntegratedDetector
+from integrated_detector import IntegratedDetector
+from frame_scheduler import AdaptiveScheduler
 
 class App:
     def __init__(self, window):
@@ -32,6 +33,7 @@ class App:
         self.running = False
         self.video_thread = None
         self.webcam_thread = None
+        self.scheduler = None  # AdaptiveScheduler of the running loop, for its metrics
 
     # ---------------- Image ----------------
     def load_image(self):
@@ -44,8 +46,8 @@ class App:
             print("Failed to load image:", path)
             return
         try:
-            annotated, _ = self.detector.detect_frame(cv2.resize(img, (960,540)))
-            self.show_frame(annotated)
+            annotated = self.detector.detect_frame(img, in_place=True, still=True)
+            self.show_frame(self._display(annotated))
         except Exception as e:
             print("Error processing image:", e)
 
@@ -64,6 +66,7 @@ class App:
 
     def video_loop(self, path):
         cap = None
+        scheduler = self.scheduler = AdaptiveScheduler(target_fps=30)
         try:
             cap = cv2.VideoCapture(path)
             while True:
@@ -71,25 +74,27 @@ class App:
                 if not ret:
                     break
                 try:
-                    annotated, _ = self.detector.detect_frame(cv2.resize(frame, (960,540)))
+                    annotated = self._process(scheduler, frame)
                 except Exception as e:
                     print("Error during video frame detection:", e)
                     annotated = frame
                 # schedule GUI update in main thread
-                self.window.after(0, lambda f=annotated: self.show_frame(f))
-                time.sleep(0.03)
+                self.window.after(0, lambda f=self._display(annotated): self.show_frame(f))
+                scheduler.frame_done()
+                time.sleep(scheduler.delay())
         except Exception as e:
             print("Video loop error:", e)
         finally:
             if cap:
                 cap.release()
+            print("[SCHEDULER]", scheduler.metrics())
 
     # ---------------- Webcam ----------------
     def start_webcam(self):
         if self.running:
             return
         self.running = True
-        self.detector.start_capture(camera_index=0)
+        self.detector.start_capture(0)
         self.webcam_thread = threading.Thread(target=self.webcam_loop)
         self.webcam_thread.daemon = True
         self.webcam_thread.start()
@@ -101,6 +106,7 @@ class App:
         self.detector.stop_capture()
 
     def webcam_loop(self):
+        scheduler = self.scheduler = AdaptiveScheduler(target_fps=30)
         try:
             cap = self.detector.cap
             if cap is None:
@@ -113,24 +119,38 @@ class App:
                     time.sleep(0.01)
                     continue
                 try:
-                    annotated, _ = self.detector.detect_frame(cv2.resize(frame, (960,540)))
+                    annotated = self._process(scheduler, frame)
                 except Exception as e:
                     print("Error during webcam frame detection:", e)
                     annotated = frame
-                # schedule GUI update
-                self.window.after(0, lambda f=annotated: self.show_frame(f))
-                time.sleep(0.03)
+                # schedule GUI update; the capture buffer is reused after the next read
+                self.window.after(0, lambda f=self._display(annotated): self.show_frame(f))
+                scheduler.frame_done()
+                time.sleep(scheduler.delay())
         except Exception as e:
             print("Webcam thread crashed:", e)
         finally:
             self.detector.stop_capture()
             self.running = False
+            print("[SCHEDULER]", scheduler.metrics())
+
+    def _process(self, scheduler, frame):
+        """Detect on every Nth frame (N picked by the scheduler); redraw the last boxes otherwise."""
+        if scheduler.should_detect():
+            with scheduler.stage("detect"):
+                return self.detector.detect_frame(frame, in_place=True)
+        with scheduler.stage("track"):
+            return self.detector.track_frame(frame, in_place=True)
 
     # ---------------- UI helpers ----------------
-    def show_frame(self, frame):
+    @staticmethod
+    def _display(frame):
+        """Label-sized RGB copy, made on the worker thread so Tk never sees a reused buffer."""
+        small = cv2.resize(frame, (920, 520))
+        return cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=small)
+
+    def show_frame(self, frame_rgb):
         try:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_rgb = cv2.resize(frame_rgb, (920, 520))
             imgtk = ImageTk.PhotoImage(Image.fromarray(frame_rgb))
             self.video_label.imgtk = imgtk
             self.video_label.configure(image=imgtk)
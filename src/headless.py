@@ -0,0 +1,178 @@
+import argparse
+import glob
+import os
+import time
+from collections import deque
+import cv2
+from inference_backend import BACKENDS
+from inference_profiles import PROFILES, get_profile
+from integrated_detector import IntegratedDetector
+from ocr_worker import OCRWorkerPool
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv")
+
+
+def expand_inputs(patterns):
+    """Expand globs and directories into a sorted list of (kind, path) pairs."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches:
+            print(f"[SKIP] nothing matches {pattern}")
+        for match in matches:
+            if os.path.isdir(match):
+                paths.extend(sorted(os.path.join(match, name) for name in os.listdir(match)))
+            else:
+                paths.append(match)
+
+    items = []
+    for path in paths:
+        ext = os.path.splitext(path)[1].lower()
+        if ext in IMAGE_EXTS:
+            items.append(("image", path))
+        elif ext in VIDEO_EXTS:
+            items.append(("video", path))
+    return items
+
+
+def group_inputs(items):
+    """(kind, paths) jobs: consecutive images form one job so they are batched together, videos run alone."""
+    jobs = []
+    for kind, path in items:
+        if kind == "image" and jobs and jobs[-1][0] == "image":
+            jobs[-1][1].append(path)
+        else:
+            jobs.append((kind, [path]))
+    return jobs
+
+
+def read_images(paths, names):
+    """Yield the readable images of paths, appending each one's name to names as it is yielded."""
+    for path in paths:
+        frame = cv2.imread(path)
+        if frame is None:
+            print(f"[SKIP] cannot read image: {path}")
+            continue
+        names.append(os.path.splitext(os.path.basename(path))[0])
+        yield frame
+
+
+def read_video(path, skip_frames, progress):
+    """Decode every (skip_frames + 1)th frame; skipped frames are grabbed but not decoded."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        print(f"[SKIP] cannot open video: {path}")
+        return
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                return
+            yield frame
+            for _ in range(skip_frames):
+                if not cap.grab():
+                    return
+                progress.skipped += 1
+    finally:
+        cap.release()
+
+
+class Progress:
+    """Counters for the run, printed every few seconds and at the end."""
+
+    def __init__(self, total_files, every=5.0):
+        self.total_files = total_files
+        self.every = every
+        self.files = 0
+        self.frames = 0
+        self.skipped = 0
+        self.started = time.time()
+        self._last_print = self.started
+
+    def frame(self, detector):
+        self.frames += 1
+        if time.time() - self._last_print >= self.every:
+            self.print(detector)
+
+    def print(self, detector):
+        self._last_print = time.time()
+        elapsed = max(self._last_print - self.started, 1e-6)
+        print(f"[PROGRESS] files {self.files}/{self.total_files} | frames {self.frames} "
+              f"({self.frames / elapsed:.1f} FPS) | skipped {self.skipped} | "
+              f"violations {detector.violations_saved}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run helmet/plate/OCR detection over images and videos without a GUI.")
+    parser.add_argument("inputs", nargs="+", help="files, directories or globs (quote them, e.g. 'archive/**/*.mp4')")
+    parser.add_argument("--out", default="violations", help="folder for violation crops and violations.csv")
+    parser.add_argument("--annotated", help="optional folder for annotated images/videos")
+    parser.add_argument("--workers", type=int, default=0, help="inference processes (0 = in-process models)")
+    parser.add_argument("--batch-size", type=int, default=8, help="frames (video frames or images) detected together")
+    parser.add_argument("--skip-frames", type=int, default=0, help="video frames skipped after each processed one")
+    parser.add_argument("--backend", default="torch", choices=BACKENDS, help="inference runtime")
+    parser.add_argument("--profile", default="balanced", choices=PROFILES, help="speed/accuracy profile")
+    parser.add_argument("--ocr-workers", type=int, help="OCR threads (default: from the profile)")
+    parser.add_argument("--no-motion-gate", action="store_true", help="run the models on static video frames too")
+    args = parser.parse_args()
+
+    items = expand_inputs(args.inputs)
+    if not items:
+        parser.error("no images or videos found")
+    if args.annotated:
+        os.makedirs(args.annotated, exist_ok=True)
+
+    ocr_workers = args.ocr_workers or get_profile(args.profile).ocr_workers
+    ocr_pool = OCRWorkerPool(workers=ocr_workers, max_pending=8 * ocr_workers)
+    detector = IntegratedDetector(save_root=args.out, motion_gating=not args.no_motion_gate, ocr_pool=ocr_pool,
+                                  workers=args.workers, backend=args.backend, profile=args.profile)
+    lookahead = max(args.batch_size, args.workers)
+    progress = Progress(len(items))
+
+    try:
+        for kind, paths in group_inputs(items):
+            if kind == "image":
+                # Every image is its own scene, but a run of them is detected in batches
+                names = deque()
+                frames = read_images(paths, names)
+            else:
+                name = os.path.splitext(os.path.basename(paths[0]))[0]
+                frames = read_video(paths[0], args.skip_frames, progress)
+
+            writer = None
+            for annotated in detector.detect_frames(frames, lookahead, in_place=True,
+                                                     still=kind == "image"):
+                progress.frame(detector)
+                if kind == "image":
+                    image_name = names.popleft()
+                    progress.files += 1
+                    if args.annotated:
+                        detector.evidence.write_image(os.path.join(args.annotated, f"{image_name}.jpg"), annotated)
+                    continue
+                if not args.annotated:
+                    continue
+                if writer is None:
+                    probe = cv2.VideoCapture(paths[0])
+                    fps = (probe.get(cv2.CAP_PROP_FPS) or 30) / (args.skip_frames + 1)
+                    probe.release()
+                    h, w = annotated.shape[:2]
+                    writer = cv2.VideoWriter(os.path.join(args.annotated, f"{name}.mp4"),
+                                             cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+                writer.write(annotated)
+            if writer:
+                writer.release()
+
+            # Settle the plates of this video (or image run) before the next one
+            detector.end_sequence()
+            if kind == "video":
+                progress.files += 1
+    except KeyboardInterrupt:
+        print("Interrupted, saving what was found so far...")
+    finally:
+        detector.release()
+        progress.print(detector)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import cv2
-import math
+import numpy as np
 import cvzone
 from ultralytics import YOLO
 
@@ -16,19 +16,17 @@ img = cv2.imread(image_path)
 # Perform object detection
 results = yolo_model(img)
 
-# Loop through the detections and draw bounding boxes
+# Pull all boxes once as an array (x1, y1, x2, y2, conf, cls) and draw them
 for r in results:
-    boxes = r.boxes
-    for box in boxes:
-        x1, y1, x2, y2 = box.xyxy[0]
-        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-
-        w, h = x2 - x1, y2 - y1
-        cvzone.cornerRect(img, (x1, y1, w, h))
-        conf = math.ceil((box.conf[0] * 100)) / 100
-        cls = int(box.cls[0])
-
-        if conf > 0.1:
+    data = r.boxes.data.cpu().numpy()
+    xyxy = data[:, :4].astype(int)
+    confs = np.ceil(data[:, -2] * 100) / 100
+    classes = data[:, -1].astype(int)
+
+    for (x1, y1, x2, y2), conf, cls, labelled in zip(xyxy.tolist(), confs.tolist(), classes.tolist(),
+                                                       (confs > 0.1).tolist()):
+        cvzone.cornerRect(img, (x1, y1, x2 - x1, y2 - y1))
+        if labelled:
             cvzone.putTextRect(img, f'{class_labels[cls]} {conf}', (x1, y1 - 10), scale=0.8, thickness=1, colorR=(255, 0, 0))
 
 # Display the image with detections
@@ -1,28 +1,51 @@
-import cv2
 import os
 import time
-import json  # For saving violation information in JSON format
-from ultralytics import YOLO
-import easyocr  # Import EasyOCR
+from fused_detector import CascadeDetector, HELMET_CLASSES
+from association import associate
+from capture_pipeline import FrameGrabber, LATEST_ONLY
+from ocr_worker import OCRWorkerPool, default_reader
+from plate_tracker import IoUTracker, TrackOCRCache, crop_quality
+from violation_store import open_store, migrate_json_array
+from evidence_writer import EvidenceWriter
+from motion_detector import MotionGate
+from frame_scheduler import BoxPropagator
 import numpy as np
 import cvzone
 import base64  # For encoding the image to base64
 
 class HelmetDetector:
     def __init__(self):
-        self.model = YOLO("Weights/best.pt")  # Load the pretrained YOLO model for helmet detection
-        self.plate_model = YOLO("Weights/plate.pt")  # Load the pretrained YOLO model for license plate detection
-        self.classNames = ['With Helmet', 'Without Helmet']
-        self.cap = cv2.VideoCapture(0)  # Initialize the webcam
+        # Helmet model on the full frame; plate model only around riders without a helmet
+        self.engine = CascadeDetector("Weights/best.pt", "Weights/plate.pt")
+        self.model = self.engine.helmet_model
+        self.plate_model = self.engine.plate_model
+        self.classNames = HELMET_CLASSES
+        self.cap = FrameGrabber(0, policy=LATEST_ONLY)  # Webcam read on its own thread, stale frames dropped
         self.running = False
+        self.motion_gate = MotionGate()  # skips inference while the webcam sees no activity
+        self.last_drawn = []  # (box, label) drawn on the last detected frame
+        self.propagator = BoxPropagator()  # moves last_drawn boxes on frames that skip detection
+        self.on_violation = None  # optional callback(violation_info), e.g. to save a clip
 
-        # Initialize EasyOCR reader
-        self.reader = easyocr.Reader(['en'])  # Set language to English
+        # EasyOCR runs in a background pool so detection never waits on it
+        self.ocr_pool = OCRWorkerPool(reader_factory=default_reader)
+
+        # Plate tracks and their cached OCR reads
+        self.plate_tracker = IoUTracker()
+        self.ocr_cache = TrackOCRCache()
+        self.waiting_violations = {}  # plate track id -> violations waiting on its confirmed text
 
         # Create folder for captured images
         self.save_path = "Captured_No_Helmet"
         os.makedirs(self.save_path, exist_ok=True)
 
+        # Append-only violation log (use a .db path for SQLite); imports a legacy violations.json once
+        self.store = open_store("violations.jsonl")
+        migrate_json_array("violations.json", self.store)
+
+        # Evidence images are encoded on a background thread
+        self.evidence = EvidenceWriter()
+
         # Folder for violation images
         self.violation_image_path = "violations_images"
         os.makedirs(self.violation_image_path, exist_ok=True)
@@ -35,87 +58,120 @@ class HelmetDetector:
         # Flag to ensure only one image is captured per violation
         self.image_captured = False  # Flag to track if image has been saved for violation
 
-    def get_frame(self):
-        """Return processed frame from webcam with both helmet and plate detection."""
-        if not self.running:
-            return None
+    def get_frame(self, detect=True, timeout=None):
+        """Return processed frame from webcam with both helmet and plate detection.
 
-        success, img = self.cap.read()
-        if not success:
+        read_frame() followed by process_frame(); None if no frame arrived.
+        """
+        img = self.read_frame(timeout)
+        return None if img is None else self.process_frame(img, detect)
+
+    def read_frame(self, timeout=None):
+        """Next webcam frame, or None if none arrived within timeout seconds (None waits).
+
+        self.cap.finished tells a stall from the end of the stream.
+        """
+        if not self.running:
             return None
+        success, img = self.cap.read(timeout=timeout)
+        return img if success else None
 
-        # Perform helmet detection
-        helmet_results = self.model(img, stream=True)
-        
-        # Perform license plate detection
-        plate_results = self.plate_model(img, stream=True)
-
-        highest_confidence = 0  # Variable to track the highest confidence score
-        highest_label = ""  # Variable to store the corresponding label
-        highest_confidence_box = None  # To store the bounding box with highest confidence
-
-        # Process helmet detection results and find the highest confidence label
-        for r in helmet_results:
-            for box in r.boxes:
-                conf = float(box.conf[0])  # Confidence score
-                cls = int(box.cls[0])
-
-                label = self.classNames[cls]
-
-                # Update the highest confidence if a higher one is found
-                if conf > highest_confidence:
-                    highest_confidence = conf
-                    highest_label = label
-                    highest_confidence_box = box
-
-                # Draw the helmet bounding box and label
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                w, h = x2 - x1, y2 - y1
-                cvzone.cornerRect(img, (x1, y1, w, h))
-                cvzone.putTextRect(img, f"{label} {conf:.2f}", (x1, max(30, y1)))
-
-        # Process license plate detection results and read text using EasyOCR
-        plate_texts = []  # Store detected license plate texts
-        for plate in plate_results:
-            for box in plate.boxes:
-                conf = float(box.conf[0])  # Confidence score
-                
-                # Extract the region of interest (ROI) for the license plate
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                plate_roi = img[y1:y2, x1:x2]  # Crop the image to the license plate region
-                
-                # Apply EasyOCR to extract text from the license plate
-                plate_text = self.extract_plate_text(plate_roi)
-                print(f"Detected Plate Text: {plate_text}")
+    def process_frame(self, img, detect=True):
+        """Annotate a webcam frame.
 
-                # Only display and save the plate if the confidence is high enough
-                if conf >= self.confidence_threshold:
-                    cvzone.cornerRect(img, (x1, y1, x2 - x1, y2 - y1))
-                    cvzone.putTextRect(img, f"Plate: {plate_text} {conf:.2f}", (x1, max(30, y1)))
+        With detect=False the models are skipped and the last detections are
+        moved to the new frame by optical flow (used by the adaptive frame scheduler).
+        """
+        if not detect:
+            return self.draw_last(img)
 
-                    # Save the detected plate information
-                    plate_texts.append(plate_text)
-                    self.save_plate_info(plate_text)  # Save the detected plate text
+        # Static scene: show the raw frame and skip both models
+        if not self.motion_gate.should_run(img):
+            self.last_drawn = []
+            return img
 
-                    # Save violation information if "Without Helmet" is detected
-                    if highest_label == "Without Helmet" and highest_confidence >= self.confidence_threshold and not self.image_captured:
-                        violation_info = {
-                            'license_plate': plate_text,
-                            'violation': 'Helmet Violation',
-                            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
-                            'image_path': self.save_violation_image(img)  # Save the image path as proof
-                        }
-                        self.save_violation_info(violation_info)
+        return self._process(img)
 
-                        # Set the flag to True after saving the image
-                        self.image_captured = True
+    def detect(self, image):
+        """Process an uploaded image for helmet and plate detection."""
+        return self._process(image)
+
+    def _process(self, img):
+        """Run the fused helmet + plate pass on img, annotate it and log violations."""
+        result = self.engine.detect(img)
+        clean = self.propagator.prepare(img)  # before any box is drawn on img
+
+        # Highest confidence helmet label decides whether this frame is a violation
+        best = result.best_helmet()
+        highest_confidence = best.conf if best else 0
+        highest_label = best.label if best else ""
+
+        # Log plates and violations whose OCR finished since the last frame
+        self.collect_ocr()
+
+        # Only plates above the confidence threshold are tracked, read and displayed
+        plates = result.plates.above(self.confidence_threshold)
+
+        # A plate is a violation only if it belongs to a confident rider without a helmet
+        riders = result.without_helmet.above(self.confidence_threshold)
+        violating = {i for i, _, _ in associate(plates.xyxy, riders.xyxy)}
+
+        # Track plates across frames so each physical plate is read once
+        plate_ids = self.plate_tracker.update(plates.boxes())
+        for plate_id in self.plate_tracker.ended:
+            self.flush_violations(plate_id)  # plate left before consensus: use the best guess
+        self.ocr_cache.evict(self.plate_tracker.ended)
+
+        # Crop every license plate region before any box is drawn on img
+        plate_rois = [img[y1:y2, x1:x2].copy() for x1, y1, x2, y2 in plates.boxes()]
+
+        # Draw the helmet bounding boxes and labels
+        self.last_drawn = []
+        helmets = result.helmets
+        for box, cls, conf in zip(helmets.boxes(), helmets.cls.tolist(), helmets.conf.tolist()):
+            self._draw(img, box, f"{helmets.names[cls]} {conf:.2f}")
+
+        # Queue license plate crops for EasyOCR in the background, one batch per frame
+        reads = []  # (plate id, crop)
+        for i, (det, plate_id, plate_roi) in enumerate(zip(plates, plate_ids, plate_rois)):
+            if plate_roi.size:
+                # Record the violation now; the plate text is attached when OCR completes
+                violation_info = None
+                if i in violating and not self.image_captured:
+                    violation_info = {
+                        'license_plate': "Unknown",
+                        'violation': 'Helmet Violation',
+                        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+                        'image_path': self.save_violation_image(img)  # Save the image path as proof
+                    }
+
+                    # Set the flag to True after saving the image
+                    self.image_captured = True
+
+                if violation_info and self.ocr_cache.is_final(plate_id):
+                    violation_info['license_plate'] = self.ocr_cache.text(plate_id) or "Unknown"
+                    self.save_violation_info(violation_info)
+                elif violation_info:
+                    # Saved once this plate's reads reach consensus (or the plate leaves)
+                    self.waiting_violations.setdefault(plate_id, []).append(violation_info)
+
+                if self.ocr_cache.needs_read(plate_id, crop_quality(plate_roi)):
+                    reads.append((plate_id, plate_roi))
+
+                plate_text = self.ocr_cache.text(plate_id) or ""
+                self._draw(img, det.box, f"Plate: {plate_text} {det.conf:.2f}")
+
+        if reads:
+            accepted = self.ocr_pool.submit_batch([crop for _, crop in reads], [pid for pid, _ in reads])
+            for plate_id, _ in reads[accepted:]:
+                self.ocr_cache.cancel(plate_id)
 
         # Save the image only if "Without Helmet" label has the highest confidence and exceeds the threshold
         if highest_label == "Without Helmet" and highest_confidence >= self.confidence_threshold and not self.image_captured:
             current_time = time.time()
             if current_time - self.last_capture_time >= self.capture_delay:
                 filename = f"{self.save_path}/no_helmet_{int(time.time())}.jpg"
-                cv2.imwrite(filename, img)
+                self.evidence.write_image(filename, img)
                 print(f"❗ Saved image: {filename}")
 
                 # Update last capture time
@@ -124,92 +180,41 @@ class HelmetDetector:
                 # Set the flag to True after saving the image
                 self.image_captured = True
 
+        self.propagator.seed(clean, [box for box, _ in self.last_drawn])
         return img
 
-    def detect(self, image):
-        """Process an uploaded image for helmet and plate detection."""
-        # Run the model on the uploaded image
-        results = self.model(image)
-        plate_results = self.plate_model(image)
-
-        highest_confidence = 0
-        highest_label = ""
-        highest_confidence_box = None
-
-        for r in results:
-            for box in r.boxes:
-                conf = float(box.conf[0])
-                cls = int(box.cls[0])
-                label = self.classNames[cls]
-                
-                if conf > highest_confidence:
-                    highest_confidence = conf
-                    highest_label = label
-                    highest_confidence_box = box
-
-                # Draw bounding box for helmet
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                w, h = x2 - x1, y2 - y1
-                cvzone.cornerRect(image, (x1, y1, w, h))
-                cvzone.putTextRect(image, f"{label} {conf:.2f}", (x1, max(30, y1)))
-
-        # Process license plate results and read text using EasyOCR
-        plate_texts = []  # List to store plate texts
-        for plate in plate_results:
-            for box in plate.boxes:
-                conf = float(box.conf[0])
-                
-                # Extract the plate region
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                plate_roi = image[y1:y2, x1:x2]
-
-                # Apply EasyOCR to extract text from the plate region
-                plate_text = self.extract_plate_text(plate_roi)
-                print(f"Detected Plate Text: {plate_text}")
-
-                if conf >= self.confidence_threshold:
-                    cvzone.cornerRect(image, (x1, y1, x2 - x1, y2 - y1))
-                    cvzone.putTextRect(image, f"Plate: {plate_text} {conf:.2f}", (x1, max(30, y1)))
-
-                    plate_texts.append(plate_text)
-                    self.save_plate_info(plate_text)
-
-                    # Save violation information if "Without Helmet" is detected
-                    if highest_label == "Without Helmet" and highest_confidence >= self.confidence_threshold and not self.image_captured:
-                        violation_info = {
-                            'license_plate': plate_text,
-                            'violation': 'Helmet Violation',
-                            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
-                            'image_path': self.save_violation_image(image)  # Save the image path as proof
-                        }
-                        self.save_violation_info(violation_info)
-
-                        # Set the flag to True after saving the image
-                        self.image_captured = True
-
-        if highest_label == "Without Helmet" and highest_confidence >= self.confidence_threshold and not self.image_captured:
-            current_time = time.time()
-            if current_time - self.last_capture_time >= self.capture_delay:
-                filename = f"{self.save_path}/no_helmet_{int(time.time())}.jpg"
-                cv2.imwrite(filename, image)
-                print(f"❗ Saved image: {filename}")
-                self.last_capture_time = current_time
-
-                # Set the flag to True after saving the image
-                self.image_captured = True
+    def _draw(self, img, box, label):
+        """Draw a corner box with label and remember it for draw_last."""
+        x1, y1, x2, y2 = box
+        cvzone.cornerRect(img, (x1, y1, x2 - x1, y2 - y1))
+        cvzone.putTextRect(img, label, (x1, max(30, y1)))
+        self.last_drawn.append((box, label))
+
+    def draw_last(self, img):
+        """Draw the last detected boxes on img, moved along with the image by optical flow."""
+        boxes = self.propagator.step(img)
+        self.last_drawn = [(box, label) for box, (_, label) in zip(boxes, self.last_drawn)]
+        for (x1, y1, x2, y2), label in self.last_drawn:
+            cvzone.cornerRect(img, (x1, y1, x2 - x1, y2 - y1))
+            cvzone.putTextRect(img, label, (x1, max(30, y1)))
+        return img
 
-        return image
+    def collect_ocr(self):
+        """Vote with finished OCR reads and save plates once their text is confirmed."""
+        for res in self.ocr_pool.poll():
+            plate_id = res.context
+            if self.ocr_cache.store(plate_id, res.text, res.confidence):
+                plate_text = self.ocr_cache.text(plate_id) or "Unknown"
+                print(f"Detected Plate Text: {plate_text}")
+                self.save_plate_info(plate_text)  # Save the detected plate text
+                self.flush_violations(plate_id)
 
-    def extract_plate_text(self, plate_roi):
-        """Use EasyOCR to extract text from the license plate ROI."""
-        # Apply EasyOCR to extract text from the plate region
-        result = self.reader.readtext(plate_roi)
-        
-        # EasyOCR returns a list of results (bounding boxes + text)
-        if result:
-            plate_text = result[0][1]  # Get the text from the first detected result
-            return plate_text
-        return "Unknown"
+    def flush_violations(self, plate_id):
+        """Save violations waiting on a plate track with its current text."""
+        plate_text = self.ocr_cache.text(plate_id) or "Unknown"
+        for info in self.waiting_violations.pop(plate_id, []):
+            info['license_plate'] = plate_text
+            self.save_violation_info(info)
 
     def save_plate_info(self, plate_text):
         """Save the detected license plate text to a file or variable."""
@@ -220,25 +225,30 @@ class HelmetDetector:
     def save_violation_image(self, img):
         """Save the violation image as proof."""
         violation_image_filename = f"{self.violation_image_path}/violation_{int(time.time())}.jpg"
-        cv2.imwrite(violation_image_filename, img)
+        self.evidence.write_image(violation_image_filename, img)
         return violation_image_filename
 
     def save_violation_info(self, violation_info):
-        """Save the violation information to a JSON file."""
-        violation_file = "violations.json"
-        if os.path.exists(violation_file):
-            with open(violation_file, "r") as file:
-                violations = json.load(file)
-        else:
-            violations = []
-
-        violations.append(violation_info)
-
-        with open(violation_file, "w") as file:
-            json.dump(violations, file, indent=4)
-        
+        """Append the violation information to the violation store."""
+        self.store.save(violation_info)
         print(f"Saved violation information: {violation_info}")
+        if self.on_violation:
+            self.on_violation(violation_info)
 
-    def release(self):
-        """Release the webcam when done."""
+    def finish(self):
+        """Release the webcam and save every violation still waiting on OCR.
+
+        Fires on_violation for those, so call it before flushing anything the
+        callback feeds (e.g. a clip recorder). Safe to call more than once.
+        """
         self.cap.release()
+        self.ocr_pool.shutdown(wait=True)
+        self.collect_ocr()
+        for plate_id in list(self.waiting_violations):
+            self.flush_violations(plate_id)
+
+    def release(self):
+        """finish(), then close the violation store and the evidence writer."""
+        self.finish()
+        self.store.close()
+        self.evidence.close()
@@ -21,13 +21,11 @@ class HelmetDetector:
 
         results = self.model(img, stream=True)
         for r in results:
-            for box in r.boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                w, h = x2 - x1, y2 - y1
-
-                cvzone.cornerRect(img, (x1, y1, w, h))
-                conf = float(box.conf[0])
-                cls = int(box.cls[0])
+            # One device-to-host copy per frame instead of three per box
+            data = r.boxes.data.cpu().numpy()
+            for (x1, y1, x2, y2), conf, cls in zip(data[:, :4].astype(int).tolist(),
+                                                   data[:, -2].tolist(), data[:, -1].astype(int).tolist()):
+                cvzone.cornerRect(img, (x1, y1, x2 - x1, y2 - y1))
                 cvzone.putTextRect(img,
                                    f"{self.classNames[cls]} {conf:.2f}",
                                    (x1, max(30, y1)))
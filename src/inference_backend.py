@@ -0,0 +1,134 @@
+import argparse
+import glob
+import os
+import time
+import cv2
+from ultralytics import YOLO
+
+# backend -> ultralytics export format and the suffix of the exported weights
+BACKENDS = {
+    "torch": (None, ".pt"),
+    "onnx": ("onnx", ".onnx"),
+    "onnx-int8": ("onnx", "_int8.onnx"),  # ONNX export with dynamic int8 weight quantization
+    "openvino": ("openvino", "_openvino_model"),
+}
+MODEL_PATHS = ("Weights/best.pt", "Weights/plate.pt")
+
+
+def backend_path(path, backend):
+    """Path of the weights for backend, e.g. Weights/best.pt -> Weights/best.onnx."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend} (choose from {', '.join(BACKENDS)})")
+    return os.path.splitext(path)[0] + BACKENDS[backend][1]
+
+
+def load_model(path, backend="torch"):
+    """Load a YOLO model for the given backend.
+
+    Exported models go through the same ultralytics YOLO API (AutoBackend picks
+    ONNX Runtime or OpenVINO), so the detectors work unchanged on any backend.
+    """
+    exported = backend_path(path, backend)
+    if not os.path.exists(exported):
+        raise FileNotFoundError(f"{exported} not found; run: python inference_backend.py export --backend {backend}")
+    return YOLO(exported, task="detect")
+
+
+def export_models(paths=MODEL_PATHS, backend="onnx", imgsz=640):
+    """Export .pt weights next to the originals and return the exported paths.
+
+    Exports use dynamic shapes so batched frames and the smaller cascade ROIs
+    (roi_imgsz) can go through the same exported model. onnx-int8 quantizes
+    the float ONNX export with ONNX Runtime's dynamic quantization, which
+    needs no calibration data.
+    """
+    fmt = BACKENDS[backend][0]
+    if fmt is None:
+        raise ValueError("Nothing to export for the torch backend")
+    exported = []
+    for path in paths:
+        print(f"Exporting {path} to {backend}...")
+        out = YOLO(path).export(format=fmt, imgsz=imgsz, dynamic=True)
+        if backend == "onnx-int8":
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            target = backend_path(path, backend)
+            quantize_dynamic(out, target, weight_type=QuantType.QUInt8)
+            out = target
+        exported.append(out)
+    return exported
+
+
+def match_detections(reference, candidate, min_iou=0.5):
+    """Pair detections of the same source/class by IoU. Returns (pairs, unmatched count)."""
+    from plate_tracker import iou
+    pairs = []
+    unused = list(candidate)
+    for ref in reference:
+        best = max((c for c in unused if c.source == ref.source and c.cls == ref.cls),
+                   key=lambda c: iou(ref.box, c.box), default=None)
+        if best is not None and iou(ref.box, best.box) >= min_iou:
+            pairs.append((ref, best))
+            unused.remove(best)
+    return pairs, len(reference) - len(pairs) + len(unused)
+
+
+def check_parity(frames, backend, helmet_model_path=MODEL_PATHS[0], plate_model_path=MODEL_PATHS[1],
+                 conf_tol=0.05, box_tol=4):
+    """Compare detections of backend against the PyTorch models on the same frames.
+
+    Passes when every detection has a counterpart within conf_tol confidence
+    and box_tol pixels per edge. Prints a per-backend timing and diff summary.
+    """
+    from fused_detector import FusedDetector
+    detectors = {name: FusedDetector(helmet_model_path, plate_model_path, backend=name)
+                 for name in ("torch", backend)}
+
+    results = {}
+    for name, detector in detectors.items():
+        detector.detect(frames[0])  # warm-up
+        start = time.perf_counter()
+        results[name] = [detector.detect(frame) for frame in frames]
+        elapsed = time.perf_counter() - start
+        print(f"[{name}] {len(frames)} frames in {elapsed:.2f}s ({elapsed / len(frames) * 1000:.1f} ms/frame)")
+
+    unmatched = 0
+    conf_diff = 0.0
+    box_diff = 0
+    for ref, cand in zip(results["torch"], results[backend]):
+        pairs, missing = match_detections(ref.detections, cand.detections)
+        unmatched += missing
+        for a, b in pairs:
+            conf_diff = max(conf_diff, abs(a.conf - b.conf))
+            box_diff = max(box_diff, max(abs(p - q) for p, q in zip(a.box, b.box)))
+
+    ok = unmatched == 0 and conf_diff <= conf_tol and box_diff <= box_tol
+    print(f"[PARITY] {backend} vs torch: {unmatched} unmatched, max conf diff {conf_diff:.3f}, "
+          f"max box diff {box_diff}px -> {'OK' if ok else 'MISMATCH'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the YOLO weights and check them against PyTorch.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="export Weights/*.pt for a backend")
+    export.add_argument("--backend", default="onnx", choices=[b for b in BACKENDS if b != "torch"])
+    export.add_argument("--imgsz", type=int, default=640)
+    check = sub.add_parser("check", help="compare an exported backend with PyTorch on sample images")
+    check.add_argument("images", nargs="+", help="image files or globs")
+    check.add_argument("--backend", default="onnx", choices=[b for b in BACKENDS if b != "torch"])
+    args = parser.parse_args()
+
+    if args.command == "export":
+        for path in export_models(backend=args.backend, imgsz=args.imgsz):
+            print("Wrote", path)
+        return
+
+    paths = sorted(p for pattern in args.images for p in glob.glob(pattern))
+    frames = [f for f in (cv2.imread(p) for p in paths) if f is not None]
+    if not frames:
+        parser.error("no readable images")
+    raise SystemExit(0 if check_parity(frames, args.backend) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import multiprocessing as mp
+import os
+import queue
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from frame_buffers import FramePool
+from fused_detector import HELMET_CLASSES, CascadeDetector, Detections, FusedResult
+
+MAX_FRAME_BYTES = 1920 * 1080 * 3
+POLL_INTERVAL = 1.0  # seconds between worker liveness checks while waiting for results
+
+
+def fit_frame(frame, max_bytes):
+    """Shrink frame to at most max_bytes. Returns (frame, scale), scale 1.0 if it already fits."""
+    if frame.nbytes <= max_bytes:
+        return frame, 1.0
+    scale = (max_bytes / frame.nbytes) ** 0.5
+    h, w = frame.shape[:2]
+    size = (max(1, int(w * scale)), max(1, int(h * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA), size[0] / w
+
+
+def _worker_main(task_q, result_q, shm_names, engine_kwargs):
+    """Worker process: own model instances, frames read in place from shared memory.
+
+    Reports (None, ..., error) once the models are loaded (error None) or failed to load.
+    """
+    try:
+        engine = CascadeDetector(**engine_kwargs)
+    except Exception as e:
+        result_q.put((None, None, None, {}, 0, repr(e)))
+        return
+    result_q.put((None, None, None, {}, 0, None))
+    slots = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    try:
+        while True:
+            task = task_q.get()
+            if task is None:
+                break
+            index, slot, shape = task
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=slots[slot].buf)
+            plate_frames = engine.plate_frames
+            try:
+                result = engine.detect(frame)
+                arrays = [(d.xyxy, d.conf, d.cls) for d in (result.helmets, result.plates)]
+                result_q.put((index, slot, arrays, engine.plate_model.names, engine.plate_frames - plate_frames, None))
+            except Exception as e:
+                result_q.put((index, slot, None, {}, 0, repr(e)))
+            del frame  # drop the view before the segment can be closed
+    finally:
+        for shm in slots:
+            shm.close()
+
+
+def _unscale(arrays, scale, shape):
+    """Map (xyxy, conf, cls) of a downscaled frame back to the original frame shape."""
+    xyxy, conf, cls = arrays
+    xyxy = xyxy / scale
+    xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, shape[1])
+    xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, shape[0])
+    return xyxy.astype(np.int32), conf, cls
+
+
+class ProcessInferencePool:
+    """Runs CascadeDetector in worker processes to use every core.
+
+    Frames are copied once into a preallocated shared-memory slot; workers
+    read them in place, so only the frame index and the (small) detection
+    arrays cross process boundaries. Results come back out of order and are
+    re-sequenced by frame index. Stateful work (tracking, OCR, saving) stays
+    in the calling process and sees frames in their original order.
+
+    Has the detect()/detect_batch() API of CascadeDetector, so it can be passed
+    as `engine` to IntegratedDetector or StreamManager. The model attributes
+    are None since the models only exist inside the workers. Extra keyword
+    arguments go to each worker's CascadeDetector.
+
+    Frames larger than a slot (max_frame_bytes) are downscaled for the
+    workers and their boxes mapped back to the original frame size.
+
+    The constructor waits until every worker has loaded its models, and a
+    worker that fails to load or dies later raises RuntimeError instead of
+    leaving submit()/get() waiting forever.
+    """
+    helmet_model = None
+    plate_model = None
+
+    def __init__(self, workers=None, slots=None, max_frame_bytes=MAX_FRAME_BYTES, **engine_kwargs):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.buffers = FramePool(max_frame_bytes, count=slots or 2 * self.workers, shared=True)
+
+        ctx = mp.get_context("spawn")  # torch is not fork-safe
+        self.task_q = ctx.Queue()
+        self.result_q = ctx.Queue()
+        self.procs = [ctx.Process(target=_worker_main, daemon=True,
+                                  args=(self.task_q, self.result_q, self.buffers.names, engine_kwargs))
+                      for _ in range(self.workers)]
+        for p in self.procs:
+            p.start()
+
+        self.next_index = 0     # index given to the next submitted frame
+        self.next_out = 0       # index the consumer expects next
+        self.in_flight = {}     # index -> FrameBuffer being read by a worker
+        self.scales = {}        # index -> (scale, original shape) of downscaled frames
+        self.finished = {}      # index -> FusedResult waiting to be emitted in order
+
+        # Same counters as CascadeDetector, summed over the workers
+        self.frames_seen = 0
+        self.plate_calls = 0
+        self.plate_frames = 0
+
+        try:
+            self._wait_ready()
+        except RuntimeError:
+            self.close()
+            raise
+
+    def _wait_ready(self):
+        """Block until every worker reports its models loaded."""
+        for _ in self.procs:
+            error = self._next_result(block=True)[-1]
+            if error:
+                raise RuntimeError(f"Inference worker failed to start: {error}")
+
+    def _check_workers(self):
+        for i, p in enumerate(self.procs):
+            if not p.is_alive():
+                raise RuntimeError(f"Inference worker {i} (pid {p.pid}) died with exit code {p.exitcode}")
+
+    def _next_result(self, block):
+        """Next message from the workers, or None. Blocking waits check that the workers are alive."""
+        if not block:
+            try:
+                return self.result_q.get(timeout=0.001)
+            except queue.Empty:
+                return None
+        while True:
+            try:
+                return self.result_q.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                self._check_workers()
+
+    def submit(self, frame):
+        """Copy frame into a free slot and queue it. Blocks while all slots are busy."""
+        original = frame.shape
+        frame, scale = fit_frame(frame, self.buffers.nbytes)
+        buf = self.buffers.acquire(frame.shape, timeout=0)
+        while buf is None:
+            self._collect(block=True)
+            buf = self.buffers.acquire(frame.shape, timeout=0)
+        buf.array[...] = frame
+        index = self.next_index
+        self.next_index += 1
+        self.in_flight[index] = buf
+        if scale != 1.0:
+            self.scales[index] = (scale, original)
+        self.task_q.put((index, buf.index, frame.shape))
+        return index
+
+    def _collect(self, block):
+        message = self._next_result(block)
+        if message is None:
+            return False
+        index, slot, arrays, plate_names, plate_frames, error = message
+        if error:
+            print(f"Inference worker error on frame {index}: {error}")
+        self.frames_seen += 1
+        # Workers detect one frame per call, so calls and frames with ROIs coincide
+        self.plate_calls += plate_frames
+        self.plate_frames += plate_frames
+        if arrays is None:
+            self.finished[index] = FusedResult(Detections("helmet", HELMET_CLASSES), Detections("plate", plate_names))
+        else:
+            helmets, plates = arrays
+            if index in self.scales:
+                scale, shape = self.scales[index]
+                helmets, plates = (_unscale(helmets, scale, shape), _unscale(plates, scale, shape))
+            self.finished[index] = FusedResult(Detections("helmet", HELMET_CLASSES, *helmets),
+                                               Detections("plate", plate_names, *plates))
+        self.scales.pop(index, None)
+        self.in_flight.pop(index).release()
+        return True
+
+    def get(self, block=True):
+        """Return (index, FusedResult) for the next frame in submission order, or None."""
+        while self.next_out not in self.finished:
+            if self.next_out >= self.next_index:
+                return None  # nothing outstanding
+            if not self._collect(block):
+                return None
+        index = self.next_out
+        self.next_out += 1
+        return index, self.finished.pop(index)
+
+    def detect_batch(self, frames):
+        """Drop-in for CascadeDetector.detect_batch: fan frames out to the workers."""
+        for frame in frames:
+            self.submit(frame)
+        return [self.get()[1] for _ in frames]
+
+    def detect(self, frame):
+        return self.detect_batch([frame])[0]
+
+    def close(self):
+        for _ in self.procs:
+            self.task_q.put(None)
+        for p in self.procs:
+            p.join(timeout=5.0)
+            if p.is_alive():
+                p.terminate()
+        for buf in self.in_flight.values():
+            buf.release()
+        self.in_flight.clear()
+        self.buffers.close()
+
@@ -0,0 +1,168 @@
+import argparse
+import os
+import time
+import cv2
+from plate_consensus import PlateVoter
+from plate_tracker import TrackOCRCache
+
+
+class Profile:
+    """Named bundle of speed/accuracy settings for the detector classes.
+
+    Covers the model input sizes (full frame and cascade ROI), the float or
+    int8-quantized ONNX weights, YOLO confidence/NMS thresholds and how much
+    OCR work is spent per plate track.
+    """
+
+    def __init__(self, name, imgsz, roi_imgsz, quantized, conf, iou,
+                 ocr_workers, ocr_min_quality, ocr_agreement, ocr_min_reads, ocr_max_reads):
+        self.name = name
+        self.imgsz = imgsz
+        self.roi_imgsz = roi_imgsz
+        self.quantized = quantized
+        self.conf = conf
+        self.iou = iou
+        self.ocr_workers = ocr_workers
+        self.ocr_min_quality = ocr_min_quality
+        self.ocr_agreement = ocr_agreement
+        self.ocr_min_reads = ocr_min_reads
+        self.ocr_max_reads = ocr_max_reads
+
+    def backend(self, default="torch"):
+        """Quantized profiles always run the int8 ONNX export."""
+        return "onnx-int8" if self.quantized else default
+
+    def detector_kwargs(self, backend="torch"):
+        """Keyword arguments for CascadeDetector."""
+        return {
+            'imgsz': self.imgsz,
+            'roi_imgsz': self.roi_imgsz,
+            'conf': self.conf,
+            'iou': self.iou,
+            'backend': self.backend(backend),
+        }
+
+    def ocr_cache(self):
+        voter = PlateVoter(agreement=self.ocr_agreement, min_reads=self.ocr_min_reads,
+                           max_reads=self.ocr_max_reads)
+        return TrackOCRCache(min_quality=self.ocr_min_quality, voter=voter)
+
+    def __repr__(self):
+        return (f"Profile({self.name}, imgsz={self.imgsz}/{self.roi_imgsz}, "
+                f"{'int8' if self.quantized else 'float'}, conf={self.conf}, iou={self.iou})")
+
+
+# balanced reproduces the previous hard-coded settings
+PROFILES = {
+    "fast": Profile("fast", imgsz=416, roi_imgsz=224, quantized=True, conf=0.35, iou=0.5,
+                    ocr_workers=1, ocr_min_quality=0.9, ocr_agreement=0.6, ocr_min_reads=2, ocr_max_reads=5),
+    "balanced": Profile("balanced", imgsz=640, roi_imgsz=320, quantized=False, conf=0.25, iou=0.7,
+                        ocr_workers=1, ocr_min_quality=0.8, ocr_agreement=0.6, ocr_min_reads=3, ocr_max_reads=10),
+    "accurate": Profile("accurate", imgsz=960, roi_imgsz=480, quantized=False, conf=0.2, iou=0.6,
+                        ocr_workers=2, ocr_min_quality=0.7, ocr_agreement=0.7, ocr_min_reads=4, ocr_max_reads=15),
+}
+DEFAULT_PROFILE = "balanced"
+
+
+def get_profile(profile=DEFAULT_PROFILE):
+    """Return a Profile by name (Profile instances pass through)."""
+    if isinstance(profile, Profile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile: {profile} (choose from {', '.join(PROFILES)})")
+    return PROFILES[profile]
+
+
+def load_sample_frames(patterns, max_frames=200, video_stride=5):
+    """Images and every video_stride-th video frame from the sample media, up to max_frames."""
+    from headless import expand_inputs
+    frames = []
+    for kind, path in expand_inputs(patterns):
+        if kind == "image":
+            frame = cv2.imread(path)
+            if frame is not None:
+                frames.append(frame)
+        else:
+            cap = cv2.VideoCapture(path)
+            index = 0
+            while len(frames) < max_frames:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if index % video_stride == 0:
+                    frames.append(frame)
+                index += 1
+            cap.release()
+        if len(frames) >= max_frames:
+            break
+    return frames[:max_frames]
+
+
+def evaluate(frames, names=tuple(PROFILES), reference="accurate", backend="torch"):
+    """Time each profile on frames and score its detections against the reference profile.
+
+    There are no ground-truth labels for the sample media, so accuracy is
+    reported as precision/recall of each profile's boxes (same class, IoU >= 0.5)
+    against what the reference profile finds. Quantized profiles whose int8
+    export is missing run on `backend` instead; the backend each profile
+    actually used is part of its metrics. Returns {name: metrics}.
+    """
+    from fused_detector import CascadeDetector
+    from inference_backend import MODEL_PATHS, backend_path, match_detections
+
+    outputs = {}
+    report = {}
+    for name in dict.fromkeys((reference,) + tuple(names)):
+        profile = get_profile(name)
+        kwargs = profile.detector_kwargs(backend)
+        missing = [backend_path(path, kwargs['backend']) for path in MODEL_PATHS
+                   if not os.path.exists(backend_path(path, kwargs['backend']))]
+        if missing and kwargs['backend'] != backend:
+            print(f"[{name}] {', '.join(missing)} not found (run: python inference_backend.py export "
+                  f"--backend {kwargs['backend']}); falling back to the {backend} float model")
+            kwargs['backend'] = backend
+        detector = CascadeDetector(**kwargs)
+        detector.detect(frames[0])  # warm-up
+        start = time.perf_counter()
+        outputs[name] = [detector.detect(frame) for frame in frames]
+        elapsed = time.perf_counter() - start
+        report[name] = {'backend': kwargs['backend'], 'fps': round(len(frames) / elapsed, 1),
+                        'ms_per_frame': round(elapsed / len(frames) * 1000, 1)}
+
+    for name in report:
+        matched = found = expected = 0
+        for ref, res in zip(outputs[reference], outputs[name]):
+            pairs, _ = match_detections(ref.detections, res.detections)
+            matched += len(pairs)
+            found += len(res.detections)
+            expected += len(ref.detections)
+        report[name]['precision'] = round(matched / found, 3) if found else 1.0
+        report[name]['recall'] = round(matched / expected, 3) if expected else 1.0
+        report[name]['detections'] = found
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inference profiles (accuracy vs FPS) on sample media.")
+    parser.add_argument("media", nargs="*", default=["Media/YOLO_Helmet_Detection_Sample_Images"],
+                        help="images, videos, folders or globs")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=PROFILES)
+    parser.add_argument("--reference", default="accurate", choices=PROFILES)
+    parser.add_argument("--backend", default="torch",
+                        help="backend for the float profiles (and quantized ones without an int8 export)")
+    parser.add_argument("--max-frames", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = load_sample_frames(args.media, args.max_frames)
+    if not frames:
+        parser.error("no sample frames found")
+    print(f"Evaluating on {len(frames)} frames, reference profile: {args.reference}")
+    report = evaluate(frames, args.profiles, args.reference, args.backend)
+    print(f"{'profile':<10} {'backend':<10} {'fps':>7} {'ms/frame':>9} {'precision':>10} {'recall':>7} {'dets':>6}")
+    for name, m in report.items():
+        print(f"{name:<10} {m['backend']:<10} {m['fps']:>7} {m['ms_per_frame']:>9} {m['precision']:>10} "
+              f"{m['recall']:>7} {m['detections']:>6}")
+
+
+if __name__ == "__main__":
+    main()
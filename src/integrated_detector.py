@@ -0,0 +1,331 @@
+import os
+import csv
+import time
+from collections import deque
+from datetime import datetime
+import cv2
+import traceback
+from fused_detector import CascadeDetector
+from inference_pool import ProcessInferencePool
+from capture_pipeline import FrameGrabber, LATEST_ONLY, BLOCK
+from ocr_worker import OCRWorkerPool, default_reader
+from plate_tracker import IoUTracker, crop_quality
+from violation_dedup import DedupIndex
+from evidence_writer import EvidenceWriter
+from motion_detector import MotionGate
+from frame_scheduler import BoxPropagator
+from inference_profiles import get_profile
+
+# ----------------- Detector Classes ----------------- #
+
+class PlateLocalizer:
+    def preprocess(self, img):
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        blur = cv2.GaussianBlur(gray, (5,5), 0)
+        edges = cv2.Canny(blur, 80, 200)
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3,3))
+        edges = cv2.dilate(edges, kernel, iterations=2)
+        return gray, edges
+
+    def find_plate_regions(self, img):
+        _, edges = self.preprocess(img)
+        contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        candidates = []
+        h_img, w_img = img.shape[:2]
+        for cnt in contours:
+            x,y,w,h = cv2.boundingRect(cnt)
+            if w == 0 or h == 0: continue
+            aspect = w / float(h)
+            area = w * h
+            if 2.0 <= aspect <= 8.0 and 2000 <= area <= 50000:
+                if w < w_img*0.95 and h < h_img*0.6:
+                    candidates.append((x,y,w,h))
+        return candidates
+
+class IntegratedDetector:
+    def __init__(self, helmet_model_path="Weights/best.pt", plate_model_path="Weights/plate.pt",
+                 save_root="violations", ocr_langs=['en'], dedup_window=60.0, jpeg_quality=90,
+                 motion_gating=True, roi_pad=(50, 20, 50, 50), engine=None, ocr_pool=None, evidence=None,
+                 workers=0, backend="torch", profile="balanced"):
+        # engine / ocr_pool / evidence may be shared between detectors (see stream_manager.py)
+        # workers > 0 runs the models in that many processes (see detect_frames)
+        # profile bundles model size/thresholds and OCR effort (see inference_profiles.py)
+        self.profile = get_profile(profile)
+        engine_kwargs = dict(self.profile.detector_kwargs(backend), helmet_model_path=helmet_model_path,
+                             plate_model_path=plate_model_path, roi_pad=roi_pad)
+        self.save_root = save_root
+        os.makedirs(self.save_root, exist_ok=True)
+        self.person_folder = os.path.join(self.save_root, "persons")
+        self.plate_folder = os.path.join(self.save_root, "plates")
+        os.makedirs(self.person_folder, exist_ok=True)
+        os.makedirs(self.plate_folder, exist_ok=True)
+
+        self.csv_path = os.path.join(self.save_root, "violations.csv")
+        if not os.path.exists(self.csv_path):
+            with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["timestamp","plate_text","person_image","plate_image","ocr_confidence"])
+
+        self.owns_engine = engine is None
+        if engine is None and workers:
+            print(f"Starting {workers} inference workers...")
+            engine = ProcessInferencePool(workers, **engine_kwargs)
+        elif engine is None:
+            print(f"Loading models ({self.profile})...")
+            engine = CascadeDetector(**engine_kwargs)
+        self.engine = engine
+        self.helmet_model = self.engine.helmet_model
+        self.plate_model = self.engine.plate_model
+        self.ocr_pool = ocr_pool or OCRWorkerPool(workers=self.profile.ocr_workers,
+                                                  reader_factory=lambda: default_reader(ocr_langs))
+        self.cap = None
+        self.last_drawn = []  # (box, color, text) drawn on the last detected frame
+        self.propagator = BoxPropagator()  # moves last_drawn boxes on frames that skip detection
+        self.motion_gate = MotionGate() if motion_gating else None
+        self.recent_plates = DedupIndex(window=dedup_window)  # one record per plate/rider per window
+
+        # Track riders and plates across frames so each plate is read once
+        self.rider_tracker = IoUTracker()
+        self.plate_tracker = IoUTracker()
+        self.ocr_cache = self.profile.ocr_cache()
+        self.plate_evidence = {}  # plate track id -> (rider id, plate crop, person crop)
+
+        # JPEG encoding and CSV appends happen off the detection loop
+        self.owns_evidence = evidence is None
+        self.violations_saved = 0
+        self.evidence = evidence or EvidenceWriter(jpeg_quality=jpeg_quality)
+
+    def _save_violation(self, plate_text, plate_crop, person_crop, confidence):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        plate_text_safe = "".join(c for c in plate_text if c.isalnum() or c in ("-", "_")).strip() or "UNKNOWN"
+        person_path = os.path.join(self.person_folder, f"person_{plate_text_safe}_{timestamp}.jpg")
+        plate_path = os.path.join(self.plate_folder, f"plate_{plate_text_safe}_{timestamp}.jpg")
+        try:
+            # Encoded and appended in order by the background writer
+            self.evidence.write_image(person_path, person_crop)
+            self.evidence.write_image(plate_path, plate_crop)
+            self.evidence.append_csv(self.csv_path, [timestamp, plate_text, person_path, plate_path, f"{confidence:.2f}"])
+            self.violations_saved += 1
+            print(f"[LOG] Violation queued: {plate_text} | person: {person_path} | plate: {plate_path}")
+        except Exception as e:
+            print("Error saving violation files:", e)
+            traceback.print_exc()
+
+    def detect_frame(self, frame, in_place=False, still=False):
+        """Annotate one frame. still=True marks a one-off image: it bypasses the motion gate."""
+        if self.motion_gate:
+            if still:
+                self.motion_gate.reset()  # the next stream must not be compared against this image
+            elif not self.motion_gate.should_run(frame):
+                # Static scene: nothing to annotate, skip both models
+                self.last_drawn = []
+                return frame
+
+        if still:
+            self._new_scene()
+        # ----- Helmet detection (plates only searched around NO-helmet riders) ----- #
+        return self.process_result(frame, self.engine.detect(frame), in_place)
+
+    def detect_frames(self, frames, lookahead=8, in_place=False, still=False):
+        """Yield annotated frames in input order.
+
+        Up to `lookahead` frames are detected together: as one detect_batch()
+        call on an in-process engine, or spread over the workers of a
+        ProcessInferencePool. Tracking and OCR still run here, one frame at a
+        time in the original order. still=True (independent images) bypasses
+        the motion gate and matches no track across frames; OCR of a batch of
+        images keeps running in the background until end_sequence().
+        """
+        pooled = isinstance(self.engine, ProcessInferencePool)
+        pending = deque()  # (frame, needs detection?) in input order
+        for frame in frames:
+            run = still or not self.motion_gate or self.motion_gate.should_run(frame)
+            if run and pooled:
+                self.engine.submit(frame)
+            pending.append((frame, run))
+            if len(pending) >= lookahead:
+                yield from self._flush_pending(pending, pooled, in_place, 1 if pooled else lookahead, still)
+        if pending:
+            yield from self._flush_pending(pending, pooled, in_place, len(pending), still)
+
+    def _flush_pending(self, pending, pooled, in_place, count, still=False):
+        """Emit the oldest `count` pending frames."""
+        batch = [pending.popleft() for _ in range(count)]
+        if pooled:
+            results = [self.engine.get()[1] if run else None for _, run in batch]
+        else:
+            to_detect = [frame for frame, run in batch if run]
+            # A window the motion gate skipped entirely never touches the models
+            results = iter(self.engine.detect_batch(to_detect) if to_detect else [])
+            results = [next(results) if run else None for _, run in batch]
+        for (frame, run), result in zip(batch, results):
+            if result is None:
+                self.last_drawn = []
+                yield frame
+            else:
+                if still:
+                    self._new_scene()
+                yield self.process_result(frame, result, in_place)
+
+    def _new_scene(self):
+        """Match nothing against earlier frames (the next one is an unrelated image).
+
+        Reads already queued for the old tracks still land by track id;
+        end_sequence() settles them.
+        """
+        self.rider_tracker.tracks.clear()
+        self.plate_tracker.tracks.clear()
+        self.last_drawn = []
+
+    def process_result(self, frame, result, in_place=False):
+        """Annotate frame from a FusedResult, track plates and queue OCR for violations.
+
+        Boxes are drawn last, after every crop has been taken, so with
+        in_place=True the caller's frame is annotated instead of a copy.
+        """
+        helmets = result.helmets
+        self.last_drawn = [(box, (0,0,255), "Helmet: NO") if cls == 1 else (box, (0,255,0), "Helmet: YES")
+                           for box, cls in zip(helmets.boxes(), helmets.cls.tolist())]
+
+        riders = result.without_helmet
+        rider_boxes = riders.boxes()
+        rider_ids = self.rider_tracker.update(rider_boxes)
+
+        # ----- Attach finished OCR reads to their violations ----- #
+        self.collect_ocr()
+
+        # ----- Plate detection ----- #
+        plate_boxes = result.plates.boxes()
+        plate_ids = self.plate_tracker.update(plate_boxes)
+        for plate_id in self.plate_tracker.ended:
+            # Plate left the scene before consensus: keep the best guess
+            if not self.ocr_cache.is_final(plate_id):
+                self._confirm_plate(plate_id)
+        self.ocr_cache.evict(self.plate_tracker.ended)
+
+        for box, plate_id in zip(plate_boxes, plate_ids):
+            self.last_drawn.append((box, (255,0,0), self.ocr_cache.text(plate_id)))
+
+        # Queue OCR only for plates inside a no-helmet rider, and only when the
+        # track has no read yet or the crop is sharper/larger than the last one.
+        # All of the frame's crops go to the recognizer as one batch.
+        reads = []  # (plate id, rider index, plate crop)
+        for i, j in result.violations():
+            (x1, y1, x2, y2), plate_id = plate_boxes[i], plate_ids[i]
+            plate_crop = frame[y1:y2, x1:x2]
+            if plate_crop.size == 0: continue
+            if self.ocr_cache.needs_read(plate_id, crop_quality(plate_crop)):
+                reads.append((plate_id, j, plate_crop))
+        if reads:
+            accepted = self.ocr_pool.submit_batch([crop for _, _, crop in reads], [pid for pid, _, _ in reads])
+            for plate_id, j, plate_crop in reads[:accepted]:
+                # Evidence from the latest read crop, saved once the plate is confirmed
+                hx1, hy1, hx2, hy2 = rider_boxes[j]
+                person_crop = frame[hy1:hy2, hx1:hx2].copy()
+                self.plate_evidence[plate_id] = (rider_ids[j], plate_crop.copy(), person_crop)
+            for plate_id, _, _ in reads[accepted:]:
+                self.ocr_cache.cancel(plate_id)
+
+        self.propagator.seed(self.propagator.prepare(frame), [box for box, _, _ in self.last_drawn])
+        return self._draw_last(frame, in_place)
+
+    @staticmethod
+    def _draw_box(annotated, box, color, text=None):
+        x1, y1, x2, y2 = box
+        cv2.rectangle(annotated, (x1,y1), (x2,y2), color, 2)
+        if text:
+            cv2.putText(annotated, text, (x1, max(0,y1-10)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+    def track_frame(self, frame, in_place=False):
+        """Cheap in-between frame: move the last detections with optical flow instead of running the models."""
+        boxes = self.propagator.step(frame)
+        self.last_drawn = [(box, color, text) for box, (_, color, text) in zip(boxes, self.last_drawn)]
+        return self._draw_last(frame, in_place)
+
+    def _draw_last(self, frame, in_place):
+        annotated = frame if in_place else frame.copy()
+        for box, color, text in self.last_drawn:
+            self._draw_box(annotated, box, color, text)
+        return annotated
+
+    def collect_ocr(self):
+        """Vote with OCR reads finished since the last call and save confirmed plates.
+
+        Returns the number of violations saved.
+        """
+        saved = 0
+        for res in self.ocr_pool.poll():
+            plate_id = res.context
+            if self.ocr_cache.store(plate_id, res.text, res.confidence):
+                saved += self._confirm_plate(plate_id)
+        return saved
+
+    def _confirm_plate(self, plate_id):
+        """Save the violation for a plate track with its consensus text. Returns 1 if saved."""
+        evidence = self.plate_evidence.pop(plate_id, None)
+        text = self.ocr_cache.text(plate_id)
+        if evidence is None or not text:
+            return 0
+        rider_id, plate_crop, person_crop = evidence
+        if self.recent_plates.seen(text, rider_id):
+            print(f"[LOG] Duplicate violation skipped: {text}")
+            return 0
+        try:
+            self._save_violation(text, plate_crop, person_crop, self.ocr_cache.voter.agreement_of(plate_id))
+            return 1
+        except Exception as e:
+            print("OCR/plate processing error:", e)
+            traceback.print_exc()
+            return 0
+
+    def end_sequence(self, timeout=30.0):
+        """Finish the current video/image before an unrelated one starts.
+
+        Waits for outstanding OCR reads, saves every plate still waiting for
+        consensus with its best guess and forgets all tracks, so nothing
+        is matched across the boundary.
+        """
+        deadline = time.time() + timeout
+        while self.ocr_pool.pending and time.time() < deadline:
+            self.collect_ocr()
+            time.sleep(0.05)
+        self.collect_ocr()
+        for plate_id in list(self.plate_evidence):
+            self._confirm_plate(plate_id)
+        # Includes tracks dropped by _new_scene() between images
+        self.ocr_cache.evict(set(self.plate_tracker.tracks) | set(self.ocr_cache.best) | set(self.ocr_cache.pending))
+        self._new_scene()
+        if self.motion_gate:
+            self.motion_gate.reset()
+
+    def start_capture(self, source=0):
+        # Live cameras only care about the newest frame; files must not lose frames
+        policy = LATEST_ONLY if isinstance(source, int) else BLOCK
+        self.cap = FrameGrabber(source, policy=policy, pooled=True)
+        return self.cap
+
+    def stop_capture(self):
+        if self.cap:
+            print("[CAPTURE]", self.cap.stats())
+            print(f"[OCR] {self.ocr_cache.reads} reads for {self.ocr_cache.requests} plate sightings")
+            if self.motion_gate:
+                print("[MOTION]", self.motion_gate.stats())
+            print(f"[CASCADE] plate model ran on {self.engine.plate_frames} of {self.engine.frames_seen} frames "
+                  f"({self.engine.plate_calls} batched calls)")
+            self.cap.release()
+            self.cap = None
+
+    def release(self):
+        self.stop_capture()
+        self.ocr_pool.shutdown(wait=True)
+        self.collect_ocr()
+        for plate_id in list(self.plate_evidence):
+            self._confirm_plate(plate_id)
+        if self.owns_evidence:
+            self.evidence.close()
+            print("[EVIDENCE]", self.evidence.stats())
+        else:
+            self.evidence.flush()
+        if self.owns_engine and isinstance(self.engine, ProcessInferencePool):
+            self.engine.close()
@@ -0,0 +1,42 @@
+import csv
+import io
+import os
+
+
+class CsvTail:
+    """Reads only the rows appended to a CSV file since the last call.
+
+    The byte offset of the last complete line is remembered, so each poll costs
+    O(new rows) instead of re-parsing the whole file. A partially written last
+    line is left for the next poll; if the file shrinks (rotated or recreated)
+    reading restarts from the top.
+    """
+
+    def __init__(self, path, skip_header=True):
+        self.path = path
+        self.skip_header = skip_header
+        self.offset = 0
+
+    def read_new(self):
+        """Return the list of rows appended since the previous call."""
+        if not os.path.exists(self.path):
+            return []
+        size = os.path.getsize(self.path)
+        if size < self.offset:
+            self.offset = 0  # file was truncated or replaced
+        if size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        end = data.rfind(b"\n")
+        if end < 0:
+            return []  # no complete line yet
+        start_offset = self.offset
+        self.offset += end + 1
+
+        rows = list(csv.reader(io.StringIO(data[:end + 1].decode("utf-8"))))
+        if self.skip_header and start_offset == 0 and rows:
+            rows = rows[1:]
+        return rows
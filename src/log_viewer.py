@@ -0,0 +1,138 @@
+import hashlib
+import os
+from tkinter import Canvas, Scrollbar
+from PIL import Image, ImageTk
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+class ThumbnailCache:
+    """On-disk thumbnail cache keyed by the SHA-1 of the source image bytes.
+
+    A log image is decoded at most once: later requests (even after a restart)
+    load the small cached JPEG instead. JPEG sources are decoded with PIL's
+    draft mode, which lets libjpeg scale down while decoding.
+    """
+
+    def __init__(self, folder, size=(300, 200)):
+        self.folder = folder
+        self.size = size
+        self._keys = {}  # (path, mtime, size) -> content hash, avoids re-hashing
+        os.makedirs(folder, exist_ok=True)
+
+    def _key(self, path):
+        st = os.stat(path)
+        stat_key = (path, st.st_mtime, st.st_size)
+        key = self._keys.get(stat_key)
+        if key is None:
+            with open(path, "rb") as f:
+                key = hashlib.sha1(f.read()).hexdigest()
+            self._keys[stat_key] = key
+        return key
+
+    def get(self, path):
+        """Return a PIL thumbnail for path, creating and caching it if needed."""
+        thumb_path = os.path.join(self.folder, self._key(path) + ".jpg")
+        if os.path.exists(thumb_path):
+            return Image.open(thumb_path)
+        img = Image.open(path)
+        img.draft("RGB", self.size)
+        thumb = img.convert("RGB").resize(self.size)
+        thumb.save(thumb_path, "JPEG", quality=85)
+        return thumb
+
+
+class LogViewer:
+    """Scrollable thumbnail grid that only decodes the thumbnails in view.
+
+    File names are listed newest first and exposed a page at a time; the next
+    page is added when the user scrolls near the end. Canvas items (and their
+    PhotoImages) exist only for visible cells and are dropped when scrolled away.
+    """
+
+    def __init__(self, parent, folder="logs", page_size=60, thumb_size=(300, 200), padding=10):
+        self.folder = folder
+        self.page_size = page_size
+        self.thumb_size = thumb_size
+        self.cell_w = thumb_size[0] + padding
+        self.cell_h = thumb_size[1] + padding
+        self.padding = padding
+        self.cache = ThumbnailCache(os.path.join(folder, ".thumbs"), thumb_size)
+
+        self.canvas = Canvas(parent, width=850, height=600)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        scrollbar = Scrollbar(parent, orient="vertical", command=self._yview)
+        scrollbar.pack(side="right", fill="y")
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas.bind("<Configure>", lambda e: self.render())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self._yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self._yview("scroll", 1, "units"))
+
+        self.files = []
+        self.loaded = 0
+        self.items = {}  # file index -> (canvas item, PhotoImage)
+        self.cols = 0
+
+    def refresh(self):
+        """Re-list the log folder and show the first page."""
+        self.files = []
+        if os.path.exists(self.folder):
+            self.files = sorted((f for f in os.listdir(self.folder) if f.lower().endswith(IMAGE_EXTS)),
+                                reverse=True)
+        self.loaded = min(self.page_size, len(self.files))
+        self._clear()
+        self.canvas.yview_moveto(0)
+        self.render()
+
+    def _clear(self):
+        for item, _ in self.items.values():
+            self.canvas.delete(item)
+        self.items = {}
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self.render()
+
+    def _on_wheel(self, event):
+        self._yview("scroll", -1 if event.delta > 0 else 1, "units")
+
+    def render(self):
+        width = max(self.canvas.winfo_width(), self.cell_w)
+        height = self.canvas.winfo_height()
+        cols = max(1, width // self.cell_w)
+        if cols != self.cols:
+            self.cols = cols
+            self._clear()  # grid positions changed
+
+        rows = (self.loaded + cols - 1) // cols
+        self.canvas.configure(scrollregion=(0, 0, width, rows * self.cell_h))
+
+        top = self.canvas.canvasy(0)
+        first_row = int(top // self.cell_h)
+        last_row = int((top + height) // self.cell_h)
+        visible = range(first_row * cols, min(self.loaded, (last_row + 1) * cols))
+
+        # Expose the next page once the viewport reaches the last loaded row
+        if visible.stop >= self.loaded - cols and self.loaded < len(self.files):
+            self.loaded = min(self.loaded + self.page_size, len(self.files))
+            self.canvas.after_idle(self.render)
+
+        for index in list(self.items):
+            if index not in visible:
+                self.canvas.delete(self.items.pop(index)[0])
+
+        for index in visible:
+            if index in self.items:
+                continue
+            path = os.path.join(self.folder, self.files[index])
+            try:
+                photo = ImageTk.PhotoImage(self.cache.get(path))
+            except (OSError, ValueError) as e:
+                print("Thumbnail error:", path, e)
+                continue
+            row, col = divmod(index, cols)
+            item = self.canvas.create_image(col * self.cell_w + self.padding // 2,
+                                            row * self.cell_h + self.padding // 2,
+                                            anchor="nw", image=photo)
+            self.items[index] = (item, photo)
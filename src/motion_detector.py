@@ -1,38 +1,122 @@
-# helmet_detector.py
+# motion_detector.py
 import cv2
-import cvzone
-from ultralytics import YOLO
-
-class HelmetDetector:
-    def __init__(self):
-        self.model = YOLO("Weights/best.pt")
-        self.classNames = ['With Helmet', 'Without Helmet']
-        self.cap = cv2.VideoCapture(0)
-        self.running = False
-
-    def get_frame(self):
-        """Return processed frame from webcam."""
-        if not self.running:
-            return None
-
-        success, img = self.cap.read()
-        if not success:
-            return None
-
-        results = self.model(img, stream=True)
-        for r in results:
-            for box in r.boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                w, h = x2 - x1, y2 - y1
-
-                cvzone.cornerRect(img, (x1, y1, w, h))
-                conf = float(box.conf[0])
-                cls = int(box.cls[0])
-                cvzone.putTextRect(img,
-                                   f"{self.classNames[cls]} {conf:.2f}",
-                                   (x1, max(30, y1)))
-
-        return img
-
-    def release(self):
-        self.cap.release()
+
+
+class MotionGate:
+    """Decides per frame whether the YOLO models need to run.
+
+    The frame is downscaled to `width` pixels wide, converted to blurred
+    grayscale and compared against a background model (MOG2 background
+    subtraction, or frame differencing against a running average with
+    method="diff"). The activity score is the fraction of pixels that changed.
+    Inference runs while activity >= threshold, for `hold` frames after the
+    last activity, and at least once every `max_skip` frames so slow changes
+    are not missed.
+    """
+
+    def __init__(self, width=160, threshold=0.002, hold=15, max_skip=150, method="mog2"):
+        self.width = width
+        self.threshold = threshold
+        self.hold = hold
+        self.max_skip = max_skip
+        self.method = method
+
+        self.frames = 0
+        self.skipped = 0
+        self.activity = 0.0
+        self.mask = None
+        self.reset()
+
+    def reset(self):
+        """Forget the background model, e.g. before frames from another source."""
+        self._shape = None
+        self._background = None
+        self._subtractor = cv2.createBackgroundSubtractorMOG2(history=300, varThreshold=25,
+                                                              detectShadows=False)
+        self._since_active = self.hold + 1
+        self._since_run = 0
+
+    def _small(self, frame):
+        h, w = frame.shape[:2]
+        size = (self.width, max(1, int(h * self.width / w)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def score(self, frame):
+        """Update the background model and return the activity score (0..1)."""
+        if frame.shape[:2] != self._shape:
+            self.reset()  # new source or resolution: start a fresh background
+            self._shape = frame.shape[:2]
+        small = self._small(frame)
+
+        if self.method == "diff":
+            if self._background is None:
+                self._background = small.astype("float32")
+            diff = cv2.absdiff(small, cv2.convertScaleAbs(self._background))
+            _, mask = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
+            cv2.accumulateWeighted(small, self._background, 0.05)
+        else:
+            mask = self._subtractor.apply(small)
+
+        self.mask = mask
+        self.activity = cv2.countNonZero(mask) / float(mask.size)
+        return self.activity
+
+    def should_run(self, frame):
+        """Return True if inference should run on this frame."""
+        self.frames += 1
+        first = self._shape is None or frame.shape[:2] != self._shape
+        activity = self.score(frame)
+
+        if activity >= self.threshold:
+            self._since_active = 0
+        else:
+            self._since_active += 1
+
+        run = first or self._since_active <= self.hold or self._since_run >= self.max_skip
+        if run:
+            self._since_run = 0
+        else:
+            self._since_run += 1
+            self.skipped += 1
+        return run
+
+    def skip_rate(self):
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'skip_rate': round(self.skip_rate(), 3),
+            'activity': round(self.activity, 4),
+        }
+
+
+if __name__ == "__main__":
+    # Highlight moving regions in the webcam feed and show the gate decision
+    gate = MotionGate()
+    cap = cv2.VideoCapture(0)
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        run = gate.should_run(frame)
+        if gate.mask is not None:
+            scale = frame.shape[1] / gate.mask.shape[1]
+            contours, _ = cv2.findContours(gate.mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            for cnt in contours:
+                x, y, w, h = [int(v * scale) for v in cv2.boundingRect(cnt)]
+                if w * h > 400:
+                    cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        color = (0, 0, 255) if run else (128, 128, 128)
+        cv2.putText(frame, f"activity {gate.activity:.4f} | {'INFER' if run else 'skip'} | "
+                           f"skip rate {gate.skip_rate():.0%}", (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+        cv2.imshow("Motion Gate", frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+    cap.release()
+    cv2.destroyAllWindows()
@@ -0,0 +1,159 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import easyocr
+from plate_ocr import PlateRecognizer
+
+
+def default_reader(langs=('en',)):
+    """CPU EasyOCR behind the plate fast path (recognizer only, readtext as fallback)."""
+    return PlateRecognizer(easyocr.Reader(list(langs), gpu=False))
+
+
+class OCRResult:
+    """Best EasyOCR read for one submitted crop, plus the caller's context."""
+    __slots__ = ("context", "text", "confidence", "raw")
+
+    def __init__(self, context, text, confidence, raw):
+        self.context = context
+        self.text = text
+        self.confidence = confidence
+        self.raw = raw
+
+
+class OCRWorkerPool:
+    """Runs EasyOCR on plate crops in background threads.
+
+    The detection loop submits crops with submit() and never waits: finished
+    reads are collected later with poll(). Each worker owns its own reader
+    since easyocr.Reader is not safe to share between threads. When more than
+    max_pending crops are in flight new submissions are dropped, so a slow OCR
+    stage cannot build an unbounded backlog.
+    """
+
+    def __init__(self, workers=1, max_pending=8, reader_factory=default_reader):
+        self.reader_factory = reader_factory
+        self.max_pending = max_pending
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._done = {}  # channel -> finished OCRResults
+        self._pending = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+
+    def _reader(self):
+        reader = getattr(self._local, "reader", None)
+        if reader is None:
+            reader = self._local.reader = self.reader_factory()
+        return reader
+
+    def submit(self, crop, context=None, preprocess=None, channel=None):
+        """Queue crop for OCR. Returns False if the pool is saturated.
+
+        Results are delivered to poll(channel), so several users (e.g. one per
+        camera stream) can share one pool without seeing each other's reads.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                return False
+            self._pending += 1
+            self.submitted += 1
+        # Copy so the caller may reuse or draw on its frame buffer
+        self.executor.submit(self._work, crop.copy(), context, preprocess, channel)
+        return True
+
+    def submit_batch(self, crops, contexts, channel=None):
+        """Queue several crops (e.g. all plates of a frame) as one OCR task.
+
+        A PlateRecognizer reader preprocesses them together and reads them
+        with one Reader.recognize call (network-batched on GPU readers only).
+        Returns how many leading crops were accepted; the rest were dropped
+        because the pool is saturated.
+        """
+        with self._lock:
+            accepted = max(0, min(len(crops), self.max_pending - self._pending))
+            self.rejected += len(crops) - accepted
+            self._pending += accepted
+            self.submitted += accepted
+        if accepted:
+            self.executor.submit(self._work_batch, [c.copy() for c in crops[:accepted]],
+                                 list(contexts[:accepted]), channel)
+        return accepted
+
+    @staticmethod
+    def _result(context, raw):
+        if raw:
+            best = max(raw, key=lambda x: x[2])
+            return OCRResult(context, best[1].strip(), float(best[2]), raw)
+        return OCRResult(context, "", 0.0, raw)
+
+    def _work(self, crop, context, preprocess, channel):
+        try:
+            image = preprocess(crop) if preprocess else crop
+            result = self._result(context, self._reader().readtext(image))
+        except Exception as e:
+            print("OCR worker error:", e)
+            result = OCRResult(context, "", 0.0, [])
+        with self._lock:
+            self._pending -= 1
+            self._done.setdefault(channel, []).append(result)
+
+    def _work_batch(self, crops, contexts, channel):
+        try:
+            reader = self._reader()
+            if hasattr(reader, "read_batch"):
+                raws = reader.read_batch(crops)
+            else:
+                raws = [reader.readtext(crop) for crop in crops]
+            results = [self._result(context, raw) for context, raw in zip(contexts, raws)]
+        except Exception as e:
+            print("OCR worker error:", e)
+            results = [OCRResult(context, "", 0.0, []) for context in contexts]
+        with self._lock:
+            self._pending -= len(crops)
+            self._done.setdefault(channel, []).extend(results)
+
+    def poll(self, channel=None):
+        """Return all reads of channel finished since the last poll, in completion order."""
+        with self._lock:
+            return self._done.pop(channel, [])
+
+    def channel(self, name):
+        """Return a view of this pool that submits to and polls only `name`."""
+        return OCRChannel(self, name)
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def shutdown(self, wait=True):
+        """Stop the workers; with wait=True in-flight reads finish first."""
+        self.executor.shutdown(wait=wait)
+
+
+class OCRChannel:
+    """A named view of a shared OCRWorkerPool with the same submit/poll API.
+
+    shutdown() is a no-op: the pool belongs to whoever created it.
+    """
+
+    def __init__(self, pool, name):
+        self.pool = pool
+        self.name = name
+
+    def submit(self, crop, context=None, preprocess=None):
+        return self.pool.submit(crop, context, preprocess, channel=self.name)
+
+    def submit_batch(self, crops, contexts):
+        return self.pool.submit_batch(crops, contexts, channel=self.name)
+
+    def poll(self):
+        return self.pool.poll(self.name)
+
+    @property
+    def pending(self):
+        return self.pool.pending
+
+    def shutdown(self, wait=True):
+        pass
@@ -0,0 +1,102 @@
+import math
+from collections import defaultdict
+
+SHARPNESS_REF = 100.0  # Laplacian variance above which a crop counts as fully sharp
+MIN_WEIGHT = 1e-6      # zero-confidence or flat-crop reads still count, just barely
+
+
+def normalize_plate(text):
+    """Uppercase and keep only letters and digits (OCR noise like '-', ';', ' ' is dropped)."""
+    return "".join(c for c in text.upper() if c.isalnum())
+
+
+def read_weight(confidence, quality):
+    """Weight of one OCR read from its confidence and (area, sharpness) crop quality."""
+    area, sharpness = quality
+    return max(MIN_WEIGHT, confidence * math.sqrt(max(area, 1)) * min(1.0, sharpness / SHARPNESS_REF))
+
+
+class PlateVote:
+    """Accumulated reads of one plate track."""
+    __slots__ = ("length_weight", "chars", "reads", "final")
+
+    def __init__(self):
+        self.length_weight = defaultdict(float)                        # len -> weight
+        self.chars = defaultdict(lambda: defaultdict(float))           # (len, pos) -> char -> weight
+        self.reads = 0
+        self.final = None
+
+
+class PlateVoter:
+    """Fuses OCR reads of the same plate track by character-level weighted voting.
+
+    Reads are grouped by length; within the dominant length every position is
+    voted on separately, weighted by OCR confidence and crop quality. A track is
+    finalized once it has min_reads reads and every position (and the length)
+    agrees by at least `agreement`, or after max_reads reads regardless.
+    """
+
+    def __init__(self, agreement=0.6, min_reads=3, max_reads=10):
+        self.agreement = agreement
+        self.min_reads = min_reads
+        self.max_reads = max_reads
+        self.votes = {}
+
+    def add(self, track_id, text, confidence, quality):
+        """Add one read. Returns True if this read finalized the track."""
+        vote = self.votes.setdefault(track_id, PlateVote())
+        if vote.final is not None:
+            return False
+        vote.reads += 1
+        text = normalize_plate(text)
+        if text:
+            weight = read_weight(confidence, quality)
+            n = len(text)
+            vote.length_weight[n] += weight
+            for pos, c in enumerate(text):
+                vote.chars[(n, pos)][c] += weight
+
+        text, score = self._consensus(vote)
+        if text and ((vote.reads >= self.min_reads and score >= self.agreement) or vote.reads >= self.max_reads):
+            vote.final = text
+            return True
+        if vote.reads >= self.max_reads:
+            vote.final = ""  # never got a usable read; stop spending OCR on it
+        return False
+
+    def _consensus(self, vote):
+        """Return (text, agreement) where agreement is the weakest position's vote share."""
+        if not vote.length_weight:
+            return "", 0.0
+        total = sum(vote.length_weight.values())
+        if total <= 0:
+            return "", 0.0  # no usable evidence yet
+        n, n_weight = max(vote.length_weight.items(), key=lambda kv: kv[1])
+        score = n_weight / total
+        chars = []
+        for pos in range(n):
+            counts = vote.chars[(n, pos)]
+            c, w = max(counts.items(), key=lambda kv: kv[1])
+            chars.append(c)
+            score = min(score, w / sum(counts.values()) if w > 0 else 0.0)
+        return "".join(chars), score
+
+    def text(self, track_id):
+        """Final text if confirmed, else the current best guess (or None)."""
+        vote = self.votes.get(track_id)
+        if vote is None:
+            return None
+        if vote.final is not None:
+            return vote.final
+        return self._consensus(vote)[0] or None
+
+    def is_final(self, track_id):
+        vote = self.votes.get(track_id)
+        return vote is not None and vote.final is not None
+
+    def agreement_of(self, track_id):
+        vote = self.votes.get(track_id)
+        return self._consensus(vote)[1] if vote else 0.0
+
+    def evict(self, track_id):
+        self.votes.pop(track_id, None)
@@ -0,0 +1,99 @@
+import re
+import numpy as np
+from plate_consensus import normalize_plate
+from plate_preprocess import PlatePreprocessor
+
+PLATE_ALLOWLIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+# 4-8 letters/digits with at least one digit (e.g. ABC1234, 123ABC, AB12345)
+PLATE_PATTERN = r"^(?=.*\d)[A-Z0-9]{4,8}$"
+
+
+class PlateRecognizer:
+    """Reads already-localized plate crops, skipping EasyOCR's text detector.
+
+    Crops go through a PlatePreprocessor (rectify, CLAHE, fixed canvas) and
+    the canvases of a batch are stacked into one image read by a single
+    Reader.recognize call, one text line per canvas. EasyOCR only runs those
+    lines through the network together on a GPU reader; on CPU it still
+    recognizes them one at a time, so batching there saves call overhead,
+    not network time. Empty crops get an empty read. Any read
+    below min_confidence or not looking like a plate (pattern) falls back to
+    the full detect+recognize Reader.readtext on the original crop and the
+    better result wins. readtext() has the same return format as
+    easyocr.Reader.readtext, so an instance can be used as the reader of an
+    OCRWorkerPool. Owns preallocated buffers: one instance per thread.
+    """
+
+    def __init__(self, reader, pattern=PLATE_PATTERN, min_confidence=0.5, allowlist=PLATE_ALLOWLIST,
+                 preprocessor=None):
+        self.reader = reader
+        self.preprocessor = preprocessor or PlatePreprocessor()
+        self.pattern = re.compile(pattern)
+        self.min_confidence = min_confidence
+        self.allowlist = allowlist
+        self.fast_reads = 0
+        self.fallbacks = 0
+
+    def is_valid(self, text):
+        return bool(self.pattern.match(normalize_plate(text)))
+
+    def _recognize_batch(self, canvases):
+        """Recognizer only, one text line per canvas; returns [(bbox, text, conf) or None].
+
+        batch_size=n lets a GPU reader run all lines in one forward pass.
+        """
+        n, h, w = canvases.shape
+        # The N x H x W buffer is contiguous, so stacking the lines is a free reshape
+        stacked = canvases.reshape(n * h, w)
+        results = self.reader.recognize(stacked, horizontal_list=[[0, w, i * h, (i + 1) * h] for i in range(n)],
+                                        free_list=[], allowlist=self.allowlist, detail=1, paragraph=False,
+                                        batch_size=n)
+        pieces = [[] for _ in range(n)]
+        for bbox, text, conf in results:
+            i = min(int(bbox[0][1]) // h, n - 1)
+            pieces[i].append((bbox[0][0], text, conf))
+        reads = []
+        for line in pieces:
+            if not line:
+                reads.append(None)
+                continue
+            # Merge pieces left to right in case the recognizer split the line
+            line.sort(key=lambda r: r[0])
+            text = "".join(r[1] for r in line)
+            conf = float(np.mean([r[2] for r in line]))
+            reads.append(([[0, 0], [w, 0], [w, h], [0, h]], text, conf))
+        return reads
+
+    def read_batch(self, images):
+        """Return a readtext()-style list [(bbox, text, confidence)] for each plate crop in images."""
+        reads = [[] for _ in images]
+        valid = [i for i, image in enumerate(images) if image is not None and image.size]
+        if not valid:
+            return reads
+        canvases = self.preprocessor.prepare_batch([images[i] for i in valid])
+        for i, fast in zip(valid, self._recognize_batch(canvases)):
+            image = images[i]
+            if fast and fast[2] >= self.min_confidence and self.is_valid(fast[1]):
+                self.fast_reads += 1
+                reads[i] = [fast]
+                continue
+
+            self.fallbacks += 1
+            raw = self.reader.readtext(image, allowlist=self.allowlist)
+            candidates = ([fast] if fast else []) + [tuple(r) for r in raw]
+            # Prefer reads that look like a plate, then the most confident one
+            if candidates:
+                reads[i] = [max(candidates, key=lambda r: (self.is_valid(r[1]), r[2]))]
+        return reads
+
+    def readtext(self, image):
+        """Return [(bbox, text, confidence)] for the plate in image."""
+        return self.read_batch([image])[0]
+
+    def stats(self):
+        total = self.fast_reads + self.fallbacks
+        return {
+            'fast_reads': self.fast_reads,
+            'fallbacks': self.fallbacks,
+            'fast_rate': round(self.fast_reads / total, 3) if total else 0.0,
+        }
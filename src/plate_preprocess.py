@@ -0,0 +1,113 @@
+import cv2
+import numpy as np
+
+# Fixed plate canvas; 64 px is the line height EasyOCR's recognizer works at,
+# so canvases reach the network without another resize
+CANVAS_HEIGHT = 64
+CANVAS_WIDTH = 256
+
+
+def to_gray(crop):
+    return crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+
+
+def deskew(gray, max_angle=20.0):
+    """Rotate a grayscale plate so its characters sit horizontally.
+
+    The angle comes from the minimum-area rectangle around the dark (text)
+    pixels; small or implausible angles leave the crop untouched.
+    """
+    _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    points = cv2.findNonZero(mask)
+    if points is None or len(points) < 10:
+        return gray
+    (_, _), (w, h), angle = cv2.minAreaRect(points)
+    if w < h:
+        angle -= 90  # minAreaRect reports the angle of the long side either way
+    if angle < -45:
+        angle += 90
+    elif angle > 45:
+        angle -= 90
+    if abs(angle) < 1.0 or abs(angle) > max_angle:
+        return gray
+    gh, gw = gray.shape[:2]
+    m = cv2.getRotationMatrix2D((gw / 2, gh / 2), angle, 1.0)
+    return cv2.warpAffine(gray, m, (gw, gh), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def plate_corners(gray, min_area=0.4):
+    """Corners (tl, tr, br, bl) of the plate border if a 4-sided outline fills the crop, else None."""
+    edges = cv2.Canny(gray, 50, 150)
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    h, w = gray.shape[:2]
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:3]:
+        approx = cv2.approxPolyDP(contour, 0.03 * cv2.arcLength(contour, True), True)
+        if len(approx) == 4 and cv2.contourArea(approx) >= min_area * h * w:
+            pts = approx.reshape(4, 2).astype(np.float32)
+            s = pts.sum(axis=1)
+            d = np.diff(pts, axis=1).ravel()
+            return np.array([pts[s.argmin()], pts[d.argmin()], pts[s.argmax()], pts[d.argmax()]], np.float32)
+    return None
+
+
+class PlatePreprocessor:
+    """Turns plate crops into fixed-size, contrast-normalized grayscale canvases.
+
+    Each crop is rectified (perspective warp when the plate border is
+    visible, otherwise deskewed and fitted keeping its aspect ratio), then
+    CLAHE-equalized, optionally Otsu-binarized. prepare_batch() writes all
+    crops of a frame into one preallocated N x H x W buffer that is reused
+    on the next call, so callers must consume it before preparing more.
+    Not thread-safe: use one instance per thread.
+    """
+
+    def __init__(self, height=CANVAS_HEIGHT, width=CANVAS_WIDTH, max_batch=16, clahe_clip=2.0, binarize=False):
+        self.height = height
+        self.width = width
+        self.binarize = binarize
+        self.clahe = cv2.createCLAHE(clipLimit=clahe_clip, tileGridSize=(2, 8))
+        self.buffer = np.empty((max_batch, height, width), np.uint8)
+        self._target = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], np.float32)
+
+    def prepare(self, crop, out=None):
+        """Preprocess one crop into out (H x W uint8, allocated if None) and return it.
+
+        Raises ValueError for an empty crop.
+        """
+        if crop is None or crop.size == 0:
+            raise ValueError("empty plate crop")
+        if out is None:
+            out = np.empty((self.height, self.width), np.uint8)
+        gray = to_gray(crop)
+        corners = plate_corners(gray)
+        if corners is not None:
+            m = cv2.getPerspectiveTransform(corners, self._target)
+            cv2.warpPerspective(gray, m, (self.width, self.height), dst=out,
+                                flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+        else:
+            self._fit(deskew(gray), out)
+        self.clahe.apply(out, dst=out)
+        if self.binarize:
+            cv2.threshold(out, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=out)
+        return out
+
+    def _fit(self, gray, out):
+        """Scale gray to fit the canvas, centred on a background of its mean level."""
+        h, w = gray.shape[:2]
+        scale = min(self.height / h, self.width / w)
+        nw, nh = max(1, int(w * scale)), max(1, int(h * scale))
+        interp = cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA
+        out.fill(int(gray.mean()))
+        x0, y0 = (self.width - nw) // 2, (self.height - nh) // 2
+        out[y0:y0 + nh, x0:x0 + nw] = cv2.resize(gray, (nw, nh), interpolation=interp)
+
+    def prepare_batch(self, crops):
+        """Preprocess crops into the shared buffer; returns an N x H x W view of it.
+
+        Raises ValueError if any crop is empty.
+        """
+        if len(crops) > len(self.buffer):
+            self.buffer = np.empty((len(crops), self.height, self.width), np.uint8)
+        for i, crop in enumerate(crops):
+            self.prepare(crop, self.buffer[i])
+        return self.buffer[:len(crops)]
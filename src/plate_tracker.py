@@ -0,0 +1,159 @@
+import itertools
+import cv2
+from plate_consensus import PlateVoter
+
+
+def iou(a, b):
+    """Intersection over union of two (x1, y1, x2, y2) boxes."""
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    if inter == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / float(area_a + area_b - inter)
+
+
+def centroid_distance(a, b):
+    """Centre distance between two boxes, relative to the diagonal of a."""
+    ax, ay = (a[0] + a[2]) / 2, (a[1] + a[3]) / 2
+    bx, by = (b[0] + b[2]) / 2, (b[1] + b[3]) / 2
+    diag = max(1.0, ((a[2] - a[0]) ** 2 + (a[3] - a[1]) ** 2) ** 0.5)
+    return ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5 / diag
+
+
+class Track:
+    __slots__ = ("id", "box", "hits", "missed")
+
+    def __init__(self, track_id, box):
+        self.id = track_id
+        self.box = box
+        self.hits = 1
+        self.missed = 0
+
+
+class IoUTracker:
+    """Greedy IoU tracker with a centroid fallback for fast-moving boxes.
+
+    update() takes this frame's boxes and returns one track ID per box, in the
+    same order. IDs of tracks not seen for max_missed frames are listed in
+    `ended` after each update so per-track state can be evicted.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_distance=0.75, max_missed=10):
+        self.iou_threshold = iou_threshold
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.tracks = {}
+        self.ended = []
+        self._ids = itertools.count(1)
+
+    def update(self, boxes):
+        tracks = list(self.tracks.values())
+        pairs = []
+        for ti, track in enumerate(tracks):
+            for bi, box in enumerate(boxes):
+                score = iou(track.box, box)
+                if score < self.iou_threshold:
+                    # Treat a close centroid as a weak match
+                    if centroid_distance(track.box, box) > self.max_distance:
+                        continue
+                    score = 0.0
+                pairs.append((score, -centroid_distance(track.box, box), ti, bi))
+        pairs.sort(reverse=True)
+
+        ids = [None] * len(boxes)
+        used_tracks = set()
+        for _, _, ti, bi in pairs:
+            if ti in used_tracks or ids[bi] is not None:
+                continue
+            track = tracks[ti]
+            track.box = boxes[bi]
+            track.hits += 1
+            track.missed = 0
+            ids[bi] = track.id
+            used_tracks.add(ti)
+
+        for bi, box in enumerate(boxes):
+            if ids[bi] is None:
+                track = Track(next(self._ids), box)
+                self.tracks[track.id] = track
+                ids[bi] = track.id
+
+        self.ended = []
+        for ti, track in enumerate(tracks):
+            if ti not in used_tracks:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    del self.tracks[track.id]
+                    self.ended.append(track.id)
+        return ids
+
+
+def crop_quality(crop):
+    """Return (area, sharpness) for a crop; sharpness is the Laplacian variance."""
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    return crop.shape[0] * crop.shape[1], float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+class TrackOCRCache:
+    """Per-track OCR state: reads are fused by a PlateVoter until the plate is confirmed.
+
+    needs_read() allows at most one read in flight per track, skips crops much
+    worse than the best one already read, and stops asking for reads once the
+    track's text is final. Entries are evicted when the track ends.
+    """
+
+    def __init__(self, min_quality=0.8, voter=None):
+        self.min_quality = min_quality
+        self.voter = voter or PlateVoter()
+        self.best = {}        # track_id -> best (area, sharpness) read so far
+        self.pending = {}     # track_id -> (area, sharpness) of the crop being read
+        self.requests = 0
+        self.reads = 0
+
+    def needs_read(self, track_id, quality):
+        """Return True if a crop of this (area, sharpness) should be OCR'd."""
+        self.requests += 1
+        if track_id in self.pending or self.voter.is_final(track_id):
+            return False
+        best = self.best.get(track_id)
+        if best is not None:
+            area, sharpness = quality
+            if area < best[0] * self.min_quality and sharpness < best[1] * self.min_quality:
+                return False
+        self.pending[track_id] = quality
+        self.reads += 1
+        return True
+
+    def cancel(self, track_id):
+        """Forget a read that could not be submitted."""
+        self.pending.pop(track_id, None)
+        self.reads -= 1
+
+    def store(self, track_id, text, confidence):
+        """Vote with a finished read. Returns True if it confirmed the plate."""
+        quality = self.pending.pop(track_id, None)
+        if quality is None:
+            return False  # track already evicted
+        best = self.best.get(track_id, (0, 0.0))
+        self.best[track_id] = (max(best[0], quality[0]), max(best[1], quality[1]))
+        return self.voter.add(track_id, text, confidence, quality)
+
+    def text(self, track_id):
+        """Confirmed text, or the best guess so far."""
+        return self.voter.text(track_id)
+
+    def is_final(self, track_id):
+        return self.voter.is_final(track_id)
+
+    def evict(self, track_ids):
+        for track_id in track_ids:
+            self.best.pop(track_id, None)
+            self.pending.pop(track_id, None)
+            self.voter.evict(track_id)
+
+    def hit_rate(self):
+        """Fraction of plate sightings that did not need an OCR call."""
+        return 1.0 - self.reads / self.requests if self.requests else 0.0
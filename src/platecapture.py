@@ -1,16 +1,21 @@
 import cv2
 import torch
-from ultralytics import YOLO
-import easyocr
+from ocr_worker import OCRWorkerPool, default_reader
+from inference_backend import load_model
+from inference_profiles import get_profile
 import tkinter as tk
 from tkinter import filedialog
 from PIL import Image, ImageTk
 
+# Input size, thresholds, weights variant and OCR threads come from the profile
+PROFILE = get_profile("balanced")
+
 # Load YOLO model
-model = YOLO("Weights/plate.pt")  # your trained model path
+model = load_model("Weights/plate.pt", PROFILE.backend())  # your trained model path
 
-# Initialize EasyOCR reader
-reader = easyocr.Reader(['en'])
+# EasyOCR runs in a background pool; the video loop only submits crops
+ocr_pool = OCRWorkerPool(workers=PROFILE.ocr_workers, reader_factory=default_reader)
+plate_texts = []  # (box, text) of the most recent finished reads
 
 # Tkinter window
 root = tk.Tk()
@@ -43,7 +48,7 @@ def stop_video():
     stop_flag = True
 
 def update_frame():
-    global cap, panel, stop_flag
+    global cap, panel, stop_flag, plate_texts
     if stop_flag or cap is None:
         if cap:
             cap.release()
@@ -56,32 +61,37 @@ def update_frame():
 
     frame = cv2.resize(frame, (800, 450))
 
-    # Detect license plates
-    results = model(frame)
-    boxes = results[0].boxes
-
-    for box in boxes:
-        x1, y1, x2, y2 = map(int, box.xyxy[0])
-        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    # Detect license plates on the clean frame
+    results = model(frame, imgsz=PROFILE.imgsz, conf=PROFILE.conf, iou=PROFILE.iou, verbose=False)
+    data = results[0].boxes.data.cpu().numpy()  # x1, y1, x2, y2, conf, cls for all plates
+    detections = list(zip(data[:, :4].astype(int).tolist(), data[:, -2].tolist(), data[:, -1].astype(int).tolist()))
 
-        # Crop plate area for OCR
+    # Crop every plate for OCR before anything is drawn (read in the background, drawn on a later frame)
+    crops, boxes = [], []
+    for (x1, y1, x2, y2), _, _ in detections:
         plate_crop = frame[y1:y2, x1:x2]
         if plate_crop.size != 0:
-            ocr_results = reader.readtext(plate_crop)
-            for (bbox, text, conf) in ocr_results:
-                cv2.putText(frame, text, (x1, y1 - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-        
+            crops.append(plate_crop.copy())
+            boxes.append((x1, y1, x2, y2))
+    if crops:
+        ocr_pool.submit_batch(crops, boxes)  # all plates of the frame in one task
+
+    # Overlays: text from OCR reads that finished since the last frame, then this frame's boxes
+    finished = ocr_pool.poll()
+    if finished:
+        plate_texts = [(res.context, res.text) for res in finished if res.text]
+    for (x1, y1, _, _), text in plate_texts:
+        cv2.putText(frame, text, (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
+    for (x1, y1, x2, y2), conf, cls_id in detections:
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+
         # Confidence and label
-        if box.conf is not None:
-            conf = float(box.conf)
-            cv2.putText(frame, f"{conf:.2f}", (x1, y2 + 20),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-        if box.cls is not None:
-            cls_id = int(box.cls)
-            label = model.names[cls_id]
-            cv2.putText(frame, label, (x1, y2 + 40),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        cv2.putText(frame, f"{conf:.2f}", (x1, y2 + 20),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        cv2.putText(frame, model.names[cls_id], (x1, y2 + 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
 
     # Convert for Tkinter
     frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -0,0 +1,105 @@
+import os
+import time
+from collections import deque
+import cv2
+import numpy as np
+
+
+class RingRecorder:
+    """Keeps the last few seconds of annotated frames in memory as JPEG bytes.
+
+    push() is called for every displayed frame; frames are sampled down to
+    `fps`, compressed and kept while they are younger than pre + post seconds
+    and the buffer is under max_bytes. trigger() marks a violation: once
+    post_seconds of frames have followed it, the pre/post context is written as
+    a single clip (plus a snapshot of the trigger frame) on the evidence writer.
+    """
+
+    def __init__(self, writer, folder="logs", pre_seconds=5.0, post_seconds=3.0, fps=10,
+                 max_bytes=64 * 1024 * 1024, jpeg_quality=70, rgb=False):
+        self.writer = writer
+        self.folder = folder
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.interval = 1.0 / fps
+        self.max_bytes = max_bytes
+        self.jpeg_quality = jpeg_quality
+        self.rgb = rgb  # frames arrive as RGB (Tk display frames)
+        self.frames = deque()  # (timestamp, jpeg bytes)
+        self.total_bytes = 0
+        self.clips_written = 0
+        self._last_push = 0.0
+        self._clip = None  # [start, end, trigger time, tag]
+        os.makedirs(folder, exist_ok=True)
+
+    def push(self, frame, now=None):
+        now = time.time() if now is None else now
+        if now - self._last_push >= self.interval:
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if ok:
+                data = buf.tobytes()
+                self.frames.append((now, data))
+                self.total_bytes += len(data)
+                self._last_push = now
+            self._evict(now)
+
+        if self._clip and now >= self._clip[1]:
+            self._write_clip()
+
+    def trigger(self, tag="violation", now=None):
+        """Mark a violation at `now`; overlapping triggers extend the same clip."""
+        now = time.time() if now is None else now
+        if self._clip:
+            self._clip[1] = now + self.post_seconds
+        else:
+            self._clip = [now - self.pre_seconds, now + self.post_seconds, now, tag]
+
+    def _evict(self, now):
+        horizon = now - (self.pre_seconds + self.post_seconds)
+        if self._clip:
+            horizon = min(horizon, self._clip[0])  # keep the pre-context of a pending clip
+        while self.frames and (self.frames[0][0] < horizon or self.total_bytes > self.max_bytes):
+            _, data = self.frames.popleft()
+            self.total_bytes -= len(data)
+
+    def _write_clip(self):
+        start, end, triggered, tag = self._clip
+        self._clip = None
+        frames = [(ts, data) for ts, data in self.frames if start <= ts <= end]
+        if not frames:
+            return
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(triggered))
+        base = os.path.join(self.folder, f"{tag}_{stamp}")
+        snapshot = min(frames, key=lambda f: abs(f[0] - triggered))[1]
+        self.writer.submit(self._encode_clip, base, frames, snapshot)
+        self.clips_written += 1
+
+    def _encode_clip(self, base, frames, snapshot):
+        # Runs on the evidence writer thread
+        with open(base + ".jpg", "wb") as f:
+            f.write(snapshot if not self.rgb else self._to_bgr_jpeg(snapshot))
+        duration = max(frames[-1][0] - frames[0][0], self.interval)
+        fps = max(1.0, (len(frames) - 1) / duration) if len(frames) > 1 else 1.0
+        out = None
+        for _, data in frames:
+            img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            if self.rgb:
+                img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+            if out is None:
+                h, w = img.shape[:2]
+                out = cv2.VideoWriter(base + ".mp4", cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+            elif img.shape[:2] != (h, w):
+                img = cv2.resize(img, (w, h))  # window was resized mid-clip
+            out.write(img)
+        if out is not None:
+            out.release()
+
+    def _to_bgr_jpeg(self, data):
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        ok, buf = cv2.imencode(".jpg", cv2.cvtColor(img, cv2.COLOR_RGB2BGR))
+        return buf.tobytes()
+
+    def flush(self):
+        """Write a pending clip immediately with whatever post-context exists."""
+        if self._clip:
+            self._write_clip()
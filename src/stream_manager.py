@@ -0,0 +1,197 @@
+import argparse
+import os
+import time
+import cv2
+from capture_pipeline import FrameGrabber, LATEST_ONLY, BLOCK
+from evidence_writer import EvidenceWriter
+from fused_detector import CascadeDetector
+from inference_backend import BACKENDS
+from inference_pool import ProcessInferencePool
+from inference_profiles import PROFILES, get_profile
+from ocr_worker import OCRWorkerPool
+from integrated_detector import IntegratedDetector
+
+
+def parse_source(source):
+    """Device indices come in as strings from the command line."""
+    return int(source) if isinstance(source, str) and source.isdigit() else source
+
+
+class Stream:
+    """One camera/file: its capture thread, per-stream detector state and stats."""
+
+    def __init__(self, name, source, detector, policy):
+        self.name = name
+        self.source = source
+        self.grabber = FrameGrabber(source, policy=policy)
+        self.detector = detector
+        self.annotated = None
+        self.frames = 0
+        self.detected = 0
+        self.started = time.time()
+
+    def stats(self):
+        elapsed = max(time.time() - self.started, 1e-6)
+        stats = {
+            'frames': self.frames,
+            'detected': self.detected,
+            'fps': round(self.frames / elapsed, 1),
+            'capture': self.grabber.stats(),
+        }
+        if self.detector.motion_gate:
+            stats['motion'] = self.detector.motion_gate.stats()
+        return stats
+
+
+class StreamManager:
+    """Runs many camera streams through one shared set of models.
+
+    Every source gets a FrameGrabber thread and its own IntegratedDetector for
+    per-stream state (motion gate, trackers, OCR cache, dedup, violations saved
+    under save_root/<stream name>), but all detectors share one CascadeDetector,
+    one OCR worker pool (through per-stream channels) and one evidence writer.
+    Each step() takes the newest frame from every stream and sends the ones
+    that need inference through the models as a single batch (batch=True) or
+    one after another (round-robin). With workers > 0 the batch is spread
+    over that many inference processes instead of one in-process model.
+
+    profiles gives each stream an inference profile (one name for all, or one
+    per source); streams on the same profile share that profile's models.
+    """
+
+    def __init__(self, sources, names=None, save_root="violations", batch=True, ocr_workers=2,
+                 helmet_model_path="Weights/best.pt", plate_model_path="Weights/plate.pt", workers=0,
+                 backend="torch", profiles="balanced"):
+        self.batch = batch
+        self.workers = workers
+        self.backend = backend
+        self.model_paths = {'helmet_model_path': helmet_model_path, 'plate_model_path': plate_model_path}
+        self.engines = {}  # profile name -> shared CascadeDetector / ProcessInferencePool
+        self.ocr_pool = OCRWorkerPool(workers=ocr_workers, max_pending=8 * ocr_workers)
+        self.evidence = EvidenceWriter()
+
+        names = names or [f"cam{i}" for i in range(len(sources))]
+        if isinstance(profiles, str):
+            profiles = [profiles] * len(sources)
+        self.streams = []
+        for name, source, profile in zip(names, sources, profiles):
+            source = parse_source(source)
+            detector = IntegratedDetector(save_root=os.path.join(save_root, name), engine=self._engine(profile),
+                                          ocr_pool=self.ocr_pool.channel(name), evidence=self.evidence,
+                                          profile=profile)
+            policy = LATEST_ONLY if isinstance(source, int) or "://" in str(source) else BLOCK
+            self.streams.append(Stream(name, source, detector, policy))
+
+    def _engine(self, profile):
+        if profile not in self.engines:
+            kwargs = dict(get_profile(profile).detector_kwargs(self.backend), **self.model_paths)
+            if self.workers:
+                print(f"Starting {self.workers} shared inference workers for profile {profile}...")
+                self.engines[profile] = ProcessInferencePool(self.workers, **kwargs)
+            else:
+                print(f"Loading shared models for profile {profile}...")
+                self.engines[profile] = CascadeDetector(**kwargs)
+        return self.engines[profile]
+
+    @property
+    def alive(self):
+        return any(not s.grabber.finished for s in self.streams)
+
+    def step(self):
+        """Process at most one new frame per stream. Returns the streams that got a frame."""
+        updated = []
+        ready = []
+        for stream in self.streams:
+            ret, frame = stream.grabber.read(timeout=0)
+            if not ret:
+                continue
+            stream.frames += 1
+            updated.append(stream)
+            gate = stream.detector.motion_gate
+            if gate and not gate.should_run(frame):
+                stream.detector.last_drawn = []
+                stream.annotated = frame
+            else:
+                ready.append((stream, frame))
+
+        for engine in self.engines.values():
+            group = [(stream, frame) for stream, frame in ready if stream.detector.engine is engine]
+            if not group:
+                continue
+            if self.batch or isinstance(engine, ProcessInferencePool):
+                results = engine.detect_batch([frame for _, frame in group])
+            else:
+                results = [engine.detect(frame) for _, frame in group]
+            for (stream, frame), result in zip(group, results):
+                stream.detected += 1
+                # The grabber hands out a fresh array per frame, so annotate it directly
+                stream.annotated = stream.detector.process_result(frame, result, in_place=True)
+        return updated
+
+    def run(self, on_frame=None, stats_every=10.0):
+        """Loop until every stream has ended; on_frame(stream) is called per new frame."""
+        last_stats = time.time()
+        try:
+            while self.alive:
+                updated = self.step()
+                if not updated:
+                    time.sleep(0.005)
+                for stream in updated:
+                    if on_frame:
+                        on_frame(stream)
+                if time.time() - last_stats >= stats_every:
+                    self.print_stats()
+                    last_stats = time.time()
+        finally:
+            self.close()
+
+    def stats(self):
+        return {s.name: s.stats() for s in self.streams}
+
+    def print_stats(self):
+        for name, stats in self.stats().items():
+            print(f"[{name}]", stats)
+
+    def close(self):
+        for stream in self.streams:
+            stream.grabber.release()
+        self.ocr_pool.shutdown(wait=True)
+        for stream in self.streams:
+            stream.detector.release()
+        self.evidence.close()
+        for engine in self.engines.values():
+            if isinstance(engine, ProcessInferencePool):
+                engine.close()
+        self.print_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run helmet/plate detection on several streams with shared models.")
+    parser.add_argument("sources", nargs="+", help="RTSP URLs, video files or device indices")
+    parser.add_argument("--names", nargs="+", help="stream names (default cam0, cam1, ...)")
+    parser.add_argument("--round-robin", action="store_true", help="run frames one by one instead of batched")
+    parser.add_argument("--show", action="store_true", help="show one window per stream")
+    parser.add_argument("--workers", type=int, default=0, help="inference processes (0 = in-process models)")
+    parser.add_argument("--backend", default="torch", choices=BACKENDS, help="inference runtime")
+    parser.add_argument("--profiles", nargs="+", default=["balanced"], choices=PROFILES,
+                        help="inference profile for all streams, or one per source")
+    args = parser.parse_args()
+    if len(args.profiles) not in (1, len(args.sources)):
+        parser.error("give one profile, or one per source")
+
+    manager = StreamManager(args.sources, names=args.names, batch=not args.round_robin, workers=args.workers,
+                            backend=args.backend,
+                            profiles=args.profiles[0] if len(args.profiles) == 1 else args.profiles)
+
+    def show(stream):
+        cv2.imshow(stream.name, stream.annotated)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            for s in manager.streams:
+                s.grabber.release()
+
+    manager.run(on_frame=show if args.show else None)
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
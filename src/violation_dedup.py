@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from plate_consensus import normalize_plate
+
+
+class DedupIndex:
+    """Remembers recently recorded violations so each one is written once.
+
+    Violations are keyed by normalized plate text and by rider/plate track ID;
+    a hit on either key within `window` seconds counts as a duplicate. Memory is
+    bounded: entries expire after the window (TTL) and the least recently seen
+    key is dropped once `max_entries` is reached (LRU).
+    """
+
+    def __init__(self, window=60.0, max_entries=1024):
+        self.window = window
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> last seen time
+        self.duplicates = 0
+
+    @staticmethod
+    def keys_for(plate_text=None, track_id=None):
+        keys = []
+        if plate_text:
+            plate = normalize_plate(plate_text)
+            if plate:
+                keys.append(("plate", plate))
+        if track_id is not None:
+            keys.append(("track", track_id))
+        return keys
+
+    def seen(self, plate_text=None, track_id=None, now=None):
+        """Return True if this violation was already recorded within the window.
+
+        Either way the keys are refreshed, so a rider that stays in view keeps
+        being suppressed.
+        """
+        now = time.time() if now is None else now
+        self._expire(now)
+        keys = self.keys_for(plate_text, track_id)
+        duplicate = any(key in self.entries for key in keys)
+        for key in keys:
+            self.entries[key] = now
+            self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        if duplicate:
+            self.duplicates += 1
+        return duplicate
+
+    def _expire(self, now):
+        # Entries are in last-seen order, so expired ones are at the front
+        while self.entries:
+            key, stamp = next(iter(self.entries.items()))
+            if now - stamp < self.window:
+                break
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
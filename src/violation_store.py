@@ -0,0 +1,163 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class JsonLinesStore:
+    """Append-only violation log, one JSON object per line.
+
+    Each save() is a single appended line, so writes are O(1) and a crash can
+    at most leave a truncated last line, which query() skips. On open, such a
+    torn line is terminated so the next record starts on a line of its own.
+    """
+
+    def __init__(self, path="violations.jsonl"):
+        self.path = path
+        self._lock = threading.Lock()
+        torn = False
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self._file = open(path, "a", encoding="utf-8")
+        if torn:
+            print(f"{path}: last record was cut off by a crash; it will be skipped")
+            self._file.write("\n")
+            self._file.flush()
+
+    def save(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def query(self, plate=None, since=None, limit=None):
+        """Return saved records, oldest first, filtered by plate text and/or timestamp."""
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn write from a crash
+                if _matches(record, plate, since):
+                    records.append(record)
+        return records[-limit:] if limit else records
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class SQLiteStore:
+    """Embedded SQLite violation store in WAL mode.
+
+    Records are buffered and committed in batches of batch_size (or every
+    flush_interval seconds), so frame-rate writers pay for one transaction per
+    batch instead of one per violation.
+    """
+
+    def __init__(self, path="violations.db", batch_size=32, flush_interval=2.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._last_flush = time.time()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS violations ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "timestamp TEXT, license_plate TEXT, violation TEXT, data TEXT)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_violations_plate ON violations(license_plate)")
+        self.conn.commit()
+
+    def save(self, record):
+        row = (record.get('timestamp'), record.get('license_plate'), record.get('violation'),
+               json.dumps(record, ensure_ascii=False))
+        with self._lock:
+            self._buffer.append(row)
+            due = time.time() - self._last_flush >= self.flush_interval
+            if len(self._buffer) >= self.batch_size or due:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO violations (timestamp, license_plate, violation, data) VALUES (?, ?, ?, ?)",
+                    self._buffer)
+            self._buffer = []
+        self._last_flush = time.time()
+
+    def query(self, plate=None, since=None, limit=None):
+        """Return saved records, oldest first, filtered by plate text and/or timestamp."""
+        sql = "SELECT data FROM violations WHERE 1=1"
+        args = []
+        if plate is not None:
+            sql += " AND license_plate = ?"
+            args.append(plate)
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            args.append(since)
+        sql += " ORDER BY id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            self._flush_locked()
+            rows = self.conn.execute(sql, args).fetchall()
+        return [json.loads(data) for (data,) in reversed(rows)]
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self.conn.close()
+
+
+def _matches(record, plate, since):
+    if plate is not None and record.get('license_plate') != plate:
+        return False
+    if since is not None and (record.get('timestamp') or "") < since:
+        return False
+    return True
+
+
+def open_store(path="violations.jsonl", **kwargs):
+    """Open a violation store; .db/.sqlite paths use SQLite, anything else JSON Lines."""
+    if os.path.splitext(path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteStore(path, **kwargs)
+    return JsonLinesStore(path)
+
+
+def migrate_json_array(json_path, store):
+    """Copy records from a legacy violations.json array into store, then rename the old file.
+
+    An unreadable (e.g. truncated) file is renamed to .corrupt and skipped.
+    """
+    if not os.path.exists(json_path):
+        return 0
+    try:
+        with open(json_path, "r") as f:
+            records = json.load(f)
+    except ValueError as e:
+        print(f"Could not migrate {json_path} ({e}); moved to {json_path}.corrupt")
+        os.replace(json_path, json_path + ".corrupt")
+        return 0
+    for record in records:
+        store.save(record)
+    store.flush()
+    os.replace(json_path, json_path + ".migrated")
+    return len(records)
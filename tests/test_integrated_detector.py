@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("torch")
+pytest.importorskip("easyocr")
+pytest.importorskip("ultralytics")
+
+from fused_detector import HELMET_CLASSES, Detections, FusedResult
+from integrated_detector import IntegratedDetector
+
+
+class StubEngine:
+    """Stands in for CascadeDetector: records batch sizes, finds nothing."""
+    helmet_model = None
+    plate_model = None
+
+    def __init__(self):
+        self.batches = []
+
+    def detect_batch(self, frames):
+        assert frames, "detect_batch called with no frames"
+        self.batches.append(len(frames))
+        return [FusedResult(Detections("helmet", HELMET_CLASSES), Detections("plate", {})) for _ in frames]
+
+
+class StubOCR:
+    pending = 0
+
+    def poll(self):
+        return []
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class StubGate:
+    def __init__(self, run):
+        self.run = run
+
+    def should_run(self, frame):
+        return self.run
+
+    def reset(self):
+        pass
+
+
+def make_detector(tmp_path, gate_runs):
+    engine = StubEngine()
+    detector = IntegratedDetector(save_root=str(tmp_path), engine=engine, ocr_pool=StubOCR())
+    detector.motion_gate = StubGate(gate_runs)
+    return detector, engine
+
+
+def frames(n):
+    return [np.zeros((48, 64, 3), np.uint8) for _ in range(n)]
+
+
+def test_full_windows_do_not_flush_an_empty_batch(tmp_path):
+    detector, engine = make_detector(tmp_path, gate_runs=True)
+    out = list(detector.detect_frames(frames(16), lookahead=8))
+    assert len(out) == 16
+    assert engine.batches == [8, 8]
+
+
+def test_static_window_skips_the_engine(tmp_path):
+    detector, engine = make_detector(tmp_path, gate_runs=False)
+    out = list(detector.detect_frames(frames(8), lookahead=8))
+    assert len(out) == 8
+    assert engine.batches == []
@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from plate_consensus import PlateVoter, read_weight
+
+
+def test_zero_confidence_read_does_not_crash():
+    voter = PlateVoter(min_reads=1)
+    voter.add(1, "ABC123", 0.0, (400, 0.0))
+    assert voter.text(1) == "ABC123"
+    assert 0.0 <= voter.agreement_of(1) <= 1.0
+
+
+def test_zero_weight_reads_lose_to_real_ones():
+    assert read_weight(0.0, (400, 50.0)) > 0
+    voter = PlateVoter(min_reads=3)
+    voter.add(1, "XYZ999", 0.0, (400, 50.0))
+    voter.add(1, "ABC123", 0.9, (400, 150.0))
+    voter.add(1, "ABC123", 0.8, (400, 150.0))
+    assert voter.text(1) == "ABC123"